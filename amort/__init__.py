@@ -1,2 +1,2 @@
 from .rates import RateSpec
-from .schedule import generar_tabla_frances, Abono
\ No newline at end of file
+from .schedule import generar_tabla_frances, generar_tabla, Abono
\ No newline at end of file
@@ -0,0 +1,93 @@
+# Comparación de varias ofertas de crédito: tasas normalizadas y tablas generadas en lote.
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .loans import LoanSpec
+from .rates import _ppya, tasas_periodicas_normalizadas
+from .schedule import generar_tablas_lote, intereses_sin_abonos
+
+def _nombres_unicos(creditos: Sequence[LoanSpec]) -> List[str]:
+    nombres: List[str] = []
+    for k, c in enumerate(creditos, start=1):
+        base = c.nombre or f"Crédito {k}"
+        nombre, j = base, 2
+        while nombre in nombres:
+            nombre, j = f"{base} ({j})", j + 1
+        nombres.append(nombre)
+    return nombres
+
+COLUMNAS_TOTALES = ["Cuota inicial", "Cuotas", "Intereses", "Abonos", "Total pagado", "Fecha final"]
+
+def totales_tabla(df: pd.DataFrame) -> Dict[str, Any]:
+    """Totales de una tabla (COLUMNAS_TOTALES); total pagado = cuotas + abonos."""
+    abonos = float(df["AbonoExtra"].sum())
+    return {
+        "Cuota inicial": float(df["Cuota"].iloc[0]),
+        "Cuotas": int(len(df)),
+        "Intereses": float(df["Interés"].sum()),
+        "Abonos": abonos,
+        "Total pagado": float(df["Cuota"].sum()) + abonos,
+        "Fecha final": df["Fecha"].iloc[-1],
+    }
+
+def comparar_creditos(creditos: Sequence[LoanSpec]) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+    """
+    Normaliza todas las tasas en una conversión vectorizada, genera las tablas en un solo lote
+    y retorna (resumen, tablas). El resumen tiene una fila por crédito:
+    Crédito | Método | Frecuencia | Tasa periodo (%) | EA (%) | Cuota inicial | Cuotas | Intereses |
+    Abonos | Total pagado | Fecha final | Ahorro abonos
+    'Ahorro abonos' = intereses sin abonos (forma cerrada del método) - intereses con abonos.
+    """
+    if not creditos:
+        raise ValueError("Se requiere al menos un crédito para comparar")
+    nombres = _nombres_unicos(creditos)
+
+    i_p = tasas_periodicas_normalizadas([c.tasa for c in creditos], [c.frecuencia for c in creditos])
+    ppy = np.array([_ppya(c.frecuencia, c.tasa.base_dias) for c in creditos], dtype=float)
+    i_ea = (1.0 + i_p) ** ppy - 1.0
+
+    tablas = generar_tablas_lote(
+        montos=[c.monto for c in creditos],
+        i_periodos=i_p,
+        n_periodos=[c.n_periodos for c in creditos],
+        frecuencias=[c.frecuencia for c in creditos],
+        fechas_inicio=[c.fecha_inicio for c in creditos],
+        abonos=[c.abonos for c in creditos],
+        metodos=[c.metodo for c in creditos],
+        gradientes=[c.gradiente for c in creditos],
+    )
+
+    filas = []
+    for k, (c, df) in enumerate(zip(creditos, tablas)):
+        totales = totales_tabla(df)
+        intereses = totales["Intereses"]
+        base = intereses_sin_abonos(c.monto, float(i_p[k]), c.n_periodos, c.metodo, c.gradiente) if c.abonos else intereses
+        filas.append({
+            "Crédito": nombres[k],
+            "Método": c.metodo,
+            "Frecuencia": c.frecuencia,
+            "Tasa periodo (%)": float(i_p[k] * 100),
+            "EA (%)": float(i_ea[k] * 100),
+            **totales,
+            "Ahorro abonos": max(base - intereses, 0.0),
+        })
+    return pd.DataFrame(filas), tablas
+
+def tabla_alineada(creditos: Sequence[LoanSpec], tablas: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Une las tablas lado a lado (Cuota y Saldo de cada crédito) alineadas por Fecha.
+    Si algún crédito no tiene fecha de inicio, se alinea por Periodo.
+    """
+    nombres = _nombres_unicos(creditos)
+    clave = "Fecha" if all(c.fecha_inicio for c in creditos) else "Periodo"
+    combinada = None
+    for nombre, df in zip(nombres, tablas):
+        parte = df[[clave, "Cuota", "Saldo"]].rename(columns={
+            "Cuota": f"Cuota ({nombre})",
+            "Saldo": f"Saldo ({nombre})",
+        })
+        combinada = parte if combinada is None else combinada.merge(parte, on=clave, how="outer")
+    return combinada.sort_values(clave).reset_index(drop=True)
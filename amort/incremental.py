@@ -0,0 +1,152 @@
+# Recálculo incremental de una cartera: huella de las entradas de cada crédito y solo se recalcula lo que cambió.
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kernel import TIPO_CUOTA, ArreglosAbonos
+from .loans import LoanSpec, tablas_de_creditos
+from .schedule import _parse_fecha_ddmmyyyy
+
+VERSION_CALCULO = 1  # subir si cambian las fórmulas: invalida todas las huellas guardadas
+ARCHIVO_MANIFIESTO = "manifiesto.sqlite"
+
+def huella(c: LoanSpec, abonos: Optional[ArreglosAbonos] = None) -> str:
+    """
+    SHA-256 de las entradas normalizadas del crédito (tasa, monto, plazo, frecuencia, fecha, abonos,
+    método y gradiente). El nombre no cuenta; la fecha se compara como fecha, no como texto.
+    abonos: los que aplicará el motor (p. ej. de una TablaAbonos), ya ordenados; por defecto c.abonos.
+    """
+    fecha = _parse_fecha_ddmmyyyy(c.fecha_inicio)
+    if abonos is None:
+        # mismo orden que aplica el motor: por periodo, estable dentro del periodo
+        eventos = [[int(a.periodo), float(a.monto), a.tipo] for a in sorted(c.abonos, key=lambda a: a.periodo)]
+    else:
+        eventos = [[p, m, "cuota" if t == TIPO_CUOTA else "plazo"]
+                   for p, m, t in zip(abonos.periodos.tolist(), abonos.montos.tolist(), abonos.tipos.tolist())]
+    datos = {
+        "version": VERSION_CALCULO,
+        "tasa": [float(c.tasa.valor), c.tasa.tipo, c.tasa.capitalizacion, c.tasa.vencimiento, int(c.tasa.base_dias)],
+        "monto": float(c.monto),
+        "n": int(c.n_periodos),
+        "frecuencia": c.frecuencia,
+        "fecha_inicio": fecha.isoformat() if fecha else None,
+        "abonos": eventos,
+        "metodo": c.metodo,
+        "gradiente": float(c.gradiente) if c.metodo == "gradiente" else 0.0,
+    }
+    texto = json.dumps(datos, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+@dataclass
+class ReporteIncremental:
+    reutilizados: int
+    recalculados: int
+    eliminados: int  # créditos del manifiesto que ya no están en la cartera
+    lote: Optional[str]  # archivo con las tablas recalculadas en esta corrida (None si no hubo)
+
+    @property
+    def total(self) -> int:
+        return self.reutilizados + self.recalculados
+
+def _conectar(dir_resultados: Path) -> sqlite3.Connection:
+    con = sqlite3.connect(dir_resultados / ARCHIVO_MANIFIESTO, timeout=60.0)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS creditos (id TEXT PRIMARY KEY, huella TEXT NOT NULL,"
+        " lote TEXT NOT NULL, inicio INTEGER NOT NULL, filas INTEGER NOT NULL)"
+    )
+    return con
+
+def _guardar_lote(dir_resultados: Path, tablas: List[pd.DataFrame]) -> Tuple[str, np.ndarray]:
+    """Concatena las tablas en un archivo nuevo de lotes/ y retorna (nombre, fila inicial de cada tabla)."""
+    filas = np.fromiter((len(t) for t in tablas), dtype=np.int64, count=len(tablas))
+    inicios = np.concatenate(([0], np.cumsum(filas)[:-1]))
+    nombre = f"lote_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pkl"
+    destino = dir_resultados / "lotes" / nombre
+    tmp = destino.with_name(destino.name + ".tmp")
+    pd.concat(tablas, ignore_index=True).to_pickle(tmp)
+    os.replace(tmp, destino)
+    return nombre, inicios
+
+def recalcular_incremental(
+    creditos: Sequence[Tuple[str, LoanSpec]],
+    dir_resultados: str | Path,
+    forzar: bool = False,
+    tabla_abonos=None,
+) -> ReporteIncremental:
+    """
+    Sincroniza dir_resultados con la cartera [(id, LoanSpec), ...]: recalcula (en un lote) solo los
+    créditos nuevos o cuya huella cambió, conserva el resto y retira los que ya no están.
+    forzar=True recalcula todo. El manifiesto se actualiza en una sola transacción después de escribir
+    el lote, así una corrida interrumpida deja el manifiesto anterior intacto.
+    tabla_abonos (amort.prepayments.TablaAbonos) agrega abonos por id; la huella incluye los abonos
+    de cada crédito en la tabla, así un cambio en el archivo recalcula solo los créditos afectados.
+    """
+    dir_resultados = Path(dir_resultados)
+    (dir_resultados / "lotes").mkdir(parents=True, exist_ok=True)
+    ids = [str(i) for i, _ in creditos]
+    if len(set(ids)) != len(ids):
+        raise ValueError("La cartera tiene ids de crédito repetidos")
+    if tabla_abonos is None:
+        huellas = [huella(c) for _, c in creditos]
+    else:
+        abonos = tabla_abonos.para_creditos(ids, [c for _, c in creditos])
+        huellas = [huella(c, a) for (_, c), a in zip(creditos, abonos)]
+
+    con = _conectar(dir_resultados)
+    try:
+        previas = dict(con.execute("SELECT id, huella FROM creditos"))
+        cambiados = [k for k, (i, h) in enumerate(zip(ids, huellas)) if forzar or previas.get(i) != h]
+        retirados = sorted(set(previas) - set(ids))
+
+        nombre = None
+        if cambiados:
+            tablas = tablas_de_creditos([creditos[k][1] for k in cambiados], tabla_abonos,
+                                        [ids[k] for k in cambiados])
+            nombre, inicios = _guardar_lote(dir_resultados, tablas)
+            nuevas = [(ids[k], huellas[k], nombre, int(inicios[j]), len(tablas[j])) for j, k in enumerate(cambiados)]
+        with con:
+            if cambiados:
+                con.executemany("INSERT OR REPLACE INTO creditos VALUES (?, ?, ?, ?, ?)", nuevas)
+            con.executemany("DELETE FROM creditos WHERE id = ?", [(i,) for i in retirados])
+        usados = {r[0] for r in con.execute("SELECT DISTINCT lote FROM creditos")}
+    finally:
+        con.close()
+
+    # lotes que ya nadie referencia
+    for ruta in (dir_resultados / "lotes").glob("lote_*.pkl"):
+        if ruta.name not in usados:
+            ruta.unlink()
+
+    return ReporteIncremental(
+        reutilizados=len(ids) - len(cambiados),
+        recalculados=len(cambiados),
+        eliminados=len(retirados),
+        lote=nombre,
+    )
+
+@lru_cache(maxsize=8)
+def _leer_lote(ruta: str) -> pd.DataFrame:
+    return pd.read_pickle(ruta)
+
+def cargar_tabla(dir_resultados: str | Path, loan_id: str) -> pd.DataFrame:
+    """Tabla guardada de un crédito (según el puntero del manifiesto)."""
+    dir_resultados = Path(dir_resultados)
+    con = _conectar(dir_resultados)
+    try:
+        fila = con.execute("SELECT lote, inicio, filas FROM creditos WHERE id = ?", (str(loan_id),)).fetchone()
+    finally:
+        con.close()
+    if fila is None:
+        raise KeyError(f"Crédito sin resultados: {loan_id!r}")
+    lote, inicio, filas = fila
+    return _leer_lote(str(dir_resultados / "lotes" / lote)).iloc[inicio:inicio + filas].reset_index(drop=True)
@@ -0,0 +1,225 @@
+# Núcleo compilado (Numba, si está instalado) del motor de tablas para créditos con muchos abonos.
+from __future__ import annotations
+from typing import Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .schedule import COLUMNAS_TABLA, TOL_CIERRE, Abono, PeriodoLiteral, _calendario, obtener_metodo
+
+try:  # dependencia opcional: pip install numba
+    from numba import njit
+    HAY_NUMBA = True
+except ImportError:  # sin Numba se usa la misma función en Python puro
+    HAY_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+# Códigos de los métodos incluidos (los registrados por terceros no tienen núcleo compilado)
+METODO_CODIGOS: Dict[str, int] = {"frances": 0, "aleman": 1, "americano": 2, "gradiente": 3}
+TIPO_PLAZO, TIPO_CUOTA = 0, 1
+_OK, _ERR_NO_AMORTIZA, _ERR_ABONO_NEGATIVO = 0, 1, 2
+
+
+@njit(cache=True)
+def _base(metodo, saldo, i, rem, g):
+    if metodo == 0:
+        if i == 0:
+            return saldo / rem
+        f = (1 + i) ** rem
+        return saldo * i * f / (f - 1)
+    if metodo == 1:
+        return saldo / rem
+    if metodo == 2:
+        return 0.0
+    if abs(i - g) < 1e-15:
+        return saldo * (1 + i) / rem
+    return saldo * (i - g) / (1 - ((1 + g) / (1 + i)) ** rem)
+
+@njit(cache=True)
+def _cuota(metodo, saldo, interes, base, j, rem, g):
+    if metodo == 0:
+        return base
+    if metodo == 1:
+        return interes + base
+    if metodo == 2:
+        return interes + (saldo if rem == 1 else 0.0)
+    return base * (1 + g) ** (j - 1)
+
+@njit(cache=True)
+def _kernel(monto, i, n_total, g, metodo, ab_periodos, ab_montos, ab_tipos, tol_cierre,
+            cuotas, intereses, amorts, extras, saldos):
+    """
+    Mismas reglas que schedule.iterar_tabla sobre arreglos planos. Escribe las filas en los
+    arreglos de salida (largo n_total) y retorna (filas, código de error).
+    ab_periodos debe venir ordenado (orden estable: respeta el orden de los abonos de un periodo).
+    """
+    amortiza_siempre = metodo != 2
+    saldo = monto
+    base = _base(metodo, saldo, i, n_total, g)
+    m = ab_periodos.shape[0]
+    p = 0
+    filas = 0
+    k = 1
+    j = 1
+    while k <= n_total and saldo > tol_cierre:
+        interes = saldo * i
+        cuota = _cuota(metodo, saldo, interes, base, j, n_total - k + 1, g)
+        amort = cuota - interes
+        if amort < 0 or (amort == 0 and amortiza_siempre):
+            return filas, _ERR_NO_AMORTIZA
+        if amort > saldo:
+            amort = saldo
+            cuota_ef = interes + amort
+        else:
+            cuota_ef = cuota
+
+        saldo_nuevo = saldo - amort
+        ab_extra = 0.0
+        hay_abono = False
+        hay_cuota = False
+        while p < m and ab_periodos[p] < k:
+            p += 1
+        while p < m and ab_periodos[p] == k:
+            ab_m = ab_montos[p]
+            if ab_m < 0:
+                return filas, _ERR_ABONO_NEGATIVO
+            ab_extra += ab_m
+            saldo_nuevo -= ab_m
+            hay_abono = True
+            if ab_tipos[p] == 1:
+                hay_cuota = True
+            p += 1
+        if hay_abono and saldo_nuevo < 0 and abs(saldo_nuevo) <= 1e-6:
+            saldo_nuevo = 0.0
+
+        saldo_fila = max(saldo_nuevo, 0.0)
+        if (saldo_nuevo <= tol_cierre or k == n_total) and abs(saldo_fila) < tol_cierre:
+            saldo_fila = 0.0
+        cuotas[filas] = cuota_ef
+        intereses[filas] = interes
+        amorts[filas] = amort
+        extras[filas] = ab_extra
+        saldos[filas] = saldo_fila
+        filas += 1
+
+        saldo = saldo_nuevo
+        if hay_cuota:
+            rem = n_total - k
+            if saldo > tol_cierre and rem > 0:
+                base = _base(metodo, saldo, i, rem, g)
+                j = 0
+        if saldo <= tol_cierre:
+            break
+        k += 1
+        j += 1
+    return filas, _OK
+
+
+class ArreglosAbonos(NamedTuple):
+    """Abonos de un crédito en arreglos planos, ordenados por periodo (orden estable)."""
+    periodos: np.ndarray  # int64
+    montos: np.ndarray    # float64
+    tipos: np.ndarray     # int8: TIPO_PLAZO / TIPO_CUOTA
+
+    def a_abonos(self) -> list:
+        return [Abono(int(p), float(m), "cuota" if t == TIPO_CUOTA else "plazo")
+                for p, m, t in zip(self.periodos, self.montos, self.tipos)]
+
+def abonos_a_arreglos(abonos: Sequence[Abono] | None) -> ArreglosAbonos:
+    """Abono(...) -> (periodos int64, montos float64, tipos int8), ordenados por periodo (orden estable)."""
+    abonos = list(abonos or ())
+    periodos = np.array([int(a.periodo) for a in abonos], dtype=np.int64)
+    montos = np.array([float(a.monto) for a in abonos], dtype=np.float64)
+    tipos = np.array([TIPO_CUOTA if a.tipo == "cuota" else TIPO_PLAZO for a in abonos], dtype=np.int8)
+    orden = np.argsort(periodos, kind="stable")
+    return ArreglosAbonos(periodos[orden], montos[orden], tipos[orden])
+
+def generar_columnas(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    ab_periodos: Optional[np.ndarray] = None,
+    ab_montos: Optional[np.ndarray] = None,
+    ab_tipos: Optional[np.ndarray] = None,
+    metodo: str = "frances",
+    gradiente: float = 0.0,
+    compilado: bool = True,
+) -> Dict[str, np.ndarray]:
+    """
+    Columnas numéricas de la tabla (Periodo, Cuota, Interés, Amortización, AbonoExtra, Saldo)
+    desde abonos en arreglos planos: periodo, monto y tipo (TIPO_PLAZO / TIPO_CUOTA).
+    Usa el núcleo compilado si Numba está instalado (y compilado=True); si no, la misma función en Python.
+    """
+    if monto <= 0:
+        raise ValueError("monto debe ser > 0")
+    if n_periodos <= 0:
+        raise ValueError("n_periodos debe ser > 0")
+    if i_periodo < 0:
+        raise ValueError("i_periodo no puede ser negativo")
+    obtener_metodo(metodo)
+    if metodo not in METODO_CODIGOS:
+        raise ValueError(f"El método {metodo!r} no tiene núcleo compilado; usa schedule.generar_tabla")
+
+    vacio = ab_periodos is None or len(ab_periodos) == 0
+    per = np.zeros(0, np.int64) if vacio else np.asarray(ab_periodos, dtype=np.int64)
+    mon = np.zeros(0, np.float64) if vacio else np.asarray(ab_montos, dtype=np.float64)
+    tip = np.zeros(0, np.int8) if vacio else np.asarray(ab_tipos, dtype=np.int8)
+    if not (len(per) == len(mon) == len(tip)):
+        raise ValueError("ab_periodos, ab_montos y ab_tipos deben tener el mismo largo")
+    if len(per) > 1 and (np.diff(per) < 0).any():
+        orden = np.argsort(per, kind="stable")
+        per, mon, tip = per[orden], mon[orden], tip[orden]
+
+    n = int(n_periodos)
+    cuotas, intereses, amorts, extras, saldos = (np.empty(n) for _ in range(5))
+    nucleo = _kernel if compilado else getattr(_kernel, "py_func", _kernel)
+    filas, error = nucleo(float(monto), float(i_periodo), n, float(gradiente), METODO_CODIGOS[metodo],
+                           per, mon, tip, TOL_CIERRE, cuotas, intereses, amorts, extras, saldos)
+    if error == _ERR_NO_AMORTIZA:
+        raise ValueError("La cuota no amortiza (amortización <= 0). Revisa tasa/periodo.")
+    if error == _ERR_ABONO_NEGATIVO:
+        raise ValueError("Abono negativo no permitido.")
+    return {
+        "Periodo": np.arange(1, filas + 1),
+        "Cuota": cuotas[:filas],
+        "Interés": intereses[:filas],
+        "Amortización": amorts[:filas],
+        "AbonoExtra": extras[:filas],
+        "Saldo": saldos[:filas],
+    }
+
+def generar_tabla_kernel(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    frecuencia: PeriodoLiteral,
+    fecha_inicio: Optional[str] = None,
+    abonos: Sequence[Abono] | None = None,
+    metodo: str = "frances",
+    gradiente: float = 0.0,
+    compilado: bool = True,
+) -> pd.DataFrame:
+    """Igual que schedule.generar_tabla (mismas columnas y tipos), calculada con el núcleo."""
+    return generar_tabla_arreglos(monto, i_periodo, n_periodos, frecuencia, fecha_inicio,
+                                  abonos_a_arreglos(abonos), metodo, gradiente, compilado)
+
+def generar_tabla_arreglos(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    frecuencia: PeriodoLiteral,
+    fecha_inicio: Optional[str] = None,
+    arreglos: Optional[ArreglosAbonos] = None,
+    metodo: str = "frances",
+    gradiente: float = 0.0,
+    compilado: bool = True,
+) -> pd.DataFrame:
+    """Como generar_tabla_kernel, con los abonos ya en arreglos planos (sin objetos Abono)."""
+    arreglos = arreglos if arreglos is not None else (None, None, None)
+    cols = generar_columnas(monto, i_periodo, n_periodos, *arreglos, metodo, gradiente, compilado)
+    cols["Fecha"] = _calendario(fecha_inicio, frecuencia, int(n_periodos))[:len(cols["Periodo"])]
+    return pd.DataFrame(cols, columns=COLUMNAS_TABLA)
@@ -0,0 +1,112 @@
+# Especificación de un crédito completo (monto, tasa, plazo, fechas y abonos) y su lectura desde dict/JSON.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .rates import RateSpec, n_from_duracion, tasas_periodicas_normalizadas
+from .schedule import METODOS, Abono, PeriodoLiteral, generar_tablas_lote
+
+PERIODOS = ["diaria","semanal","quincenal","mensual","bimestral","trimestral","semestral","anual"]
+
+@dataclass
+class LoanSpec:
+    nombre: str
+    monto: float
+    tasa: RateSpec
+    n_periodos: int
+    frecuencia: PeriodoLiteral
+    fecha_inicio: Optional[str] = None  # DD/MM/YYYY
+    abonos: List[Abono] = field(default_factory=list)
+    metodo: str = "frances"
+    gradiente: float = 0.0  # crecimiento de la cuota por periodo (decimal), solo metodo='gradiente'
+
+def abono_desde_dict(a: Dict[str, Any]) -> Abono:
+    tipo = a.get("tipo", "plazo")
+    if tipo not in ("plazo","cuota"):
+        raise ValueError("Cada abono debe tener tipo 'plazo' o 'cuota'.")
+    return Abono(periodo=int(a["periodo"]), monto=float(a["monto"]), tipo=tipo)
+
+def loan_desde_dict(d: Dict[str, Any], nombre_por_defecto: str = "") -> LoanSpec:
+    """
+    Lee un crédito con las mismas claves que los argumentos de cli.py:
+    monto, tasa_valor, tasa_tipo, tasa_cap, [tasa_venc], [base_dias], frecuencia,
+    n_periodos o (duracion + duracion_unidad), [fecha_inicio], [abonos], [nombre],
+    [metodo], [gradiente] (en %, como en la CLI).
+    """
+    faltan = [k for k in ("monto","tasa_valor","tasa_tipo","tasa_cap","frecuencia") if k not in d]
+    if faltan:
+        raise ValueError(f"Faltan campos del crédito: {', '.join(faltan)}")
+    if d["frecuencia"] not in PERIODOS or d["tasa_cap"] not in PERIODOS:
+        raise ValueError("frecuencia y tasa_cap deben ser uno de: " + ", ".join(PERIODOS))
+    if d["tasa_tipo"] not in ("nominal","efectiva"):
+        raise ValueError("tasa_tipo debe ser 'nominal' o 'efectiva'")
+    venc = d.get("tasa_venc", "vencida")
+    if venc not in ("vencida","anticipada"):
+        raise ValueError("tasa_venc debe ser 'vencida' o 'anticipada'")
+    metodo = d.get("metodo", "frances")
+    if metodo not in METODOS:
+        raise ValueError("metodo debe ser uno de: " + ", ".join(METODOS))
+    base_dias = int(d.get("base_dias", 360))
+    if base_dias not in (360, 365):
+        raise ValueError("base_dias debe ser 360 o 365")
+
+    monto = float(d["monto"])
+    if monto <= 0:
+        raise ValueError("monto debe ser > 0")
+    if float(d["tasa_valor"]) < 0:
+        raise ValueError("tasa_valor no puede ser negativa")
+
+    if d.get("n_periodos") is not None:
+        n_periodos = int(d["n_periodos"])
+        if n_periodos <= 0:
+            raise ValueError("n_periodos debe ser > 0")
+    elif d.get("duracion") is not None and d.get("duracion_unidad") is not None:
+        n_periodos = n_from_duracion(d["frecuencia"], base_dias, float(d["duracion"]), d["duracion_unidad"])
+    else:
+        raise ValueError("Debes indicar n_periodos o (duracion y duracion_unidad).")
+
+    return LoanSpec(
+        nombre=str(d.get("nombre") or nombre_por_defecto),
+        monto=monto,
+        tasa=RateSpec(
+            valor=float(d["tasa_valor"]),
+            tipo=d["tasa_tipo"],
+            capitalizacion=d["tasa_cap"],
+            vencimiento=venc,
+            base_dias=base_dias,
+        ),
+        n_periodos=n_periodos,
+        frecuencia=d["frecuencia"],
+        fecha_inicio=d.get("fecha_inicio") or None,
+        abonos=[abono_desde_dict(a) for a in d.get("abonos") or []],
+        metodo=metodo,
+        gradiente=float(d.get("gradiente", 0.0)) / 100.0,
+    )
+
+def tablas_de_creditos(
+    creditos: Sequence[LoanSpec],
+    tabla_abonos=None,
+    ids: Sequence[str] | None = None,
+) -> List[pd.DataFrame]:
+    """
+    Tablas de varios créditos: tasas normalizadas en una conversión vectorizada y generación en lote.
+    tabla_abonos (amort.prepayments.TablaAbonos) agrega los abonos de cada id (por defecto el nombre)
+    como vistas de la tabla, sin crear objetos Abono.
+    """
+    if not creditos:
+        return []
+    abonos = [c.abonos for c in creditos]
+    if tabla_abonos is not None:
+        abonos = tabla_abonos.para_creditos(ids if ids is not None else [c.nombre for c in creditos], creditos)
+    return generar_tablas_lote(
+        montos=[c.monto for c in creditos],
+        i_periodos=tasas_periodicas_normalizadas([c.tasa for c in creditos], [c.frecuencia for c in creditos]),
+        n_periodos=[c.n_periodos for c in creditos],
+        frecuencias=[c.frecuencia for c in creditos],
+        fechas_inicio=[c.fecha_inicio for c in creditos],
+        abonos=abonos,
+        metodos=[c.metodo for c in creditos],
+        gradientes=[c.gradiente for c in creditos],
+    )
@@ -0,0 +1,216 @@
+# Optimizador de abonos: en qué periodos y de qué tipo abonar un presupuesto para minimizar intereses.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .schedule import Abono, TOL_CIERRE, _cuota_frances
+
+TIPOS_ABONO = ("plazo", "cuota")
+
+def _cuotas_frances_vec(saldo: np.ndarray, i: float, rem: int) -> np.ndarray:
+    """_cuota_frances aplicada a un vector de saldos con la misma tasa y plazo restante."""
+    if i == 0:
+        return saldo / rem
+    f = (1 + i) ** rem
+    return saldo * i * f / (f - 1)
+
+def evaluar_abonos_lote(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    ab_plazo: np.ndarray,
+    ab_cuota: Optional[np.ndarray] = None,
+    con_saldos: bool = False,
+) -> np.ndarray | Tuple[np.ndarray, np.ndarray]:
+    """
+    Intereses totales de m conjuntos de abonos candidatos, evaluados a la vez.
+
+    ab_plazo, ab_cuota: matrices (m, n_periodos); la columna k-1 es el monto abonado en el periodo k.
+    Reproduce las reglas de generar_tabla_frances (cuota vigente, recálculo por abonos 'cuota',
+    cierre por tolerancia) pero sin construir filas: una pasada por periodo, vectorizada en m.
+    con_saldos=True retorna además (m, n_periodos) con el saldo de cada periodo tras la cuota y antes
+    de los abonos (lo máximo que se puede abonar ahí); 0 en periodos con el crédito ya cancelado.
+    """
+    ab_plazo = np.atleast_2d(np.asarray(ab_plazo, dtype=float))
+    ab_cuota = np.zeros_like(ab_plazo) if ab_cuota is None else np.atleast_2d(np.asarray(ab_cuota, dtype=float))
+    if ab_plazo.shape != ab_cuota.shape or ab_plazo.shape[1] != n_periodos:
+        raise ValueError("ab_plazo y ab_cuota deben tener forma (m, n_periodos)")
+    if (ab_plazo < 0).any() or (ab_cuota < 0).any():
+        raise ValueError("Abono negativo no permitido.")
+
+    m = ab_plazo.shape[0]
+    i = float(i_periodo)
+    saldo = np.full(m, float(monto))
+    cuota = np.full(m, _cuota_frances(float(monto), i, int(n_periodos)))
+    intereses = np.zeros(m)
+    saldos = np.zeros((m, int(n_periodos))) if con_saldos else None
+    activo = saldo > TOL_CIERRE
+    for k in range(1, int(n_periodos) + 1):
+        if not activo.any():
+            break
+        interes = saldo * i
+        amort = np.minimum(cuota - interes, saldo)
+        if con_saldos:
+            saldos[:, k - 1] = np.where(activo, saldo - amort, 0.0)
+        nuevo = saldo - amort - ab_plazo[:, k - 1] - ab_cuota[:, k - 1]
+        intereses += np.where(activo, interes, 0.0)
+        saldo = np.where(activo, nuevo, saldo)
+        rem = int(n_periodos) - k
+        if rem > 0:
+            recalc = activo & (ab_cuota[:, k - 1] > 0) & (saldo > TOL_CIERRE)
+            if recalc.any():
+                cuota = np.where(recalc, _cuotas_frances_vec(saldo, i, rem), cuota)
+        activo &= saldo > TOL_CIERRE
+    return (intereses, saldos) if con_saldos else intereses
+
+def ahorro_marginal(i_periodo: float, n_periodos: int, periodos: Sequence[int], tipo: str) -> np.ndarray:
+    """
+    Intereses ahorrados por cada peso abonado en 'periodos' (abono único y pequeño, forma cerrada):
+    - 'plazo': el peso se capitaliza hasta el final y elimina cuotas de la cola -> (1+i)^rem - 1
+    - 'cuota': el peso deja de pagar una anualidad de rem cuotas -> rem * c(i, rem) - 1
+    donde rem = n - periodo.
+    """
+    rem = int(n_periodos) - np.asarray(periodos, dtype=float)
+    i = float(i_periodo)
+    if i == 0:
+        return np.zeros_like(rem)
+    if tipo == "plazo":
+        return (1.0 + i) ** rem - 1.0
+    if tipo == "cuota":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f = (1.0 + i) ** rem
+            c = np.where(rem > 0, i * f / (f - 1.0), 0.0)
+        return np.where(rem > 0, rem * c - 1.0, 0.0)
+    raise ValueError("tipo debe ser 'plazo' o 'cuota'")
+
+@dataclass
+class ResultadoOptimizacion:
+    abonos: List[Abono] = field(default_factory=list)
+    interes_base: float = 0.0     # intereses sin abonos
+    interes_optimo: float = 0.0   # intereses con los abonos recomendados
+
+    @property
+    def ahorro(self) -> float:
+        return self.interes_base - self.interes_optimo
+
+def optimizar_abonos(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    presupuesto: float,
+    periodos: Sequence[int] | None = None,
+    tipos: Sequence[str] = TIPOS_ABONO,
+    paso: float | None = None,
+    max_por_periodo: float | None = None,
+    flujo: Dict[int, float] | None = None,
+    max_candidatos: int = 64,
+) -> ResultadoOptimizacion:
+    """
+    Reparte 'presupuesto' en abonos para minimizar los intereses totales (búsqueda voraz).
+
+    - periodos: periodos candidatos (por defecto 1..n_periodos-1).
+    - tipos: tipos de abono permitidos ('plazo' y/o 'cuota').
+    - paso: tamaño de cada incremento (por defecto presupuesto/20); el residuo va en un último incremento.
+      Un incremento nunca supera el saldo que queda en su periodo, así que no se recomienda pagar de más.
+    - max_por_periodo: tope de abono por periodo (sumando ambos tipos).
+    - flujo: dinero disponible por periodo {periodo: monto}; lo abonado hasta k no puede superar
+      lo disponible hasta k. Si se indica, el presupuesto se limita a la suma del flujo y se
+      descartan los periodos sin dinero acumulado.
+    - max_candidatos: cuántas celdas (periodo, tipo) se evalúan, elegidas por ahorro_marginal.
+
+    En cada incremento se evalúan en lote (evaluar_abonos_lote) todas las celdas candidatas y se
+    elige la que más reduce los intereses; se detiene cuando ningún incremento ahorra.
+    """
+    if monto <= 0:
+        raise ValueError("monto debe ser > 0")
+    if n_periodos <= 0:
+        raise ValueError("n_periodos debe ser > 0")
+    if presupuesto < 0:
+        raise ValueError("presupuesto no puede ser negativo")
+    if not tipos or any(t not in TIPOS_ABONO for t in tipos):
+        raise ValueError("tipos debe contener 'plazo' y/o 'cuota'")
+    if paso is not None and paso <= 0:
+        raise ValueError("paso debe ser > 0")
+    n = int(n_periodos)
+    periodos = sorted({int(k) for k in (periodos if periodos is not None else range(1, n))})
+    if any(k < 1 or k > n for k in periodos):
+        raise ValueError(f"Los periodos candidatos deben estar entre 1 y {n}")
+
+    disponible_acum: Optional[np.ndarray] = None
+    if flujo is not None:
+        disp = np.zeros(n)
+        for k, v in flujo.items():
+            if not 1 <= int(k) <= n:
+                raise ValueError(f"Periodo de flujo fuera de rango: {k}")
+            disp[int(k) - 1] += float(v)
+        disponible_acum = np.cumsum(disp)
+        presupuesto = min(float(presupuesto), float(disponible_acum[-1]))
+        # sin dinero acumulado no se puede abonar: fuera antes de podar por ahorro marginal
+        periodos = [k for k in periodos if disponible_acum[k - 1] > 0]
+
+    interes_base = float(evaluar_abonos_lote(monto, i_periodo, n, np.zeros((1, n)))[0])
+    if presupuesto <= 0 or not periodos:
+        return ResultadoOptimizacion([], interes_base, interes_base)
+
+    # Celdas candidatas (periodo, tipo), podadas por el ahorro marginal de forma cerrada
+    celdas: List[Tuple[int, str]] = []
+    puntaje: List[float] = []
+    for t in tipos:
+        celdas += [(k, t) for k in periodos]
+        puntaje += list(ahorro_marginal(i_periodo, n, periodos, t))
+    orden = np.argsort(-np.asarray(puntaje), kind="stable")[:max(1, int(max_candidatos))]
+    celdas = [celdas[j] for j in orden]
+    col = np.array([k - 1 for k, _ in celdas])
+    es_cuota = np.array([t == "cuota" for _, t in celdas])
+
+    paso = float(paso) if paso is not None else presupuesto / 20.0
+    incrementos = [paso] * int(presupuesto // paso)
+    resto = presupuesto - paso * len(incrementos)
+    if resto > TOL_CIERRE:
+        incrementos.append(resto)
+
+    plazo = np.zeros(n)
+    cuota = np.zeros(n)
+    interes_actual = interes_base
+    filas = np.arange(len(celdas))
+    for delta in incrementos:
+        # Cada celda abona como máximo el saldo que queda en su periodo (nunca más de lo adeudado)
+        asignado = plazo + cuota
+        _, saldos = evaluar_abonos_lote(monto, i_periodo, n, plazo[None, :], cuota[None, :], con_saldos=True)
+        montos = np.minimum(delta, saldos[0, col] - asignado[col])
+        # Factibilidad de cada celda: saldo, tope por periodo y dinero disponible acumulado
+        ok = montos > TOL_CIERRE
+        if max_por_periodo is not None:
+            ok &= asignado[col] + montos <= float(max_por_periodo) + 1e-9
+        if disponible_acum is not None:
+            holgura = disponible_acum - np.cumsum(asignado)
+            # abonar en k consume holgura de k en adelante
+            min_holgura_desde = np.minimum.accumulate(holgura[::-1])[::-1]
+            ok &= min_holgura_desde[col] + 1e-9 >= montos
+        if not ok.any():
+            break
+
+        cand_plazo = np.repeat(plazo[None, :], len(celdas), axis=0)
+        cand_cuota = np.repeat(cuota[None, :], len(celdas), axis=0)
+        cand_plazo[filas[~es_cuota], col[~es_cuota]] += montos[~es_cuota]
+        cand_cuota[filas[es_cuota], col[es_cuota]] += montos[es_cuota]
+        intereses, saldos = evaluar_abonos_lote(monto, i_periodo, n, cand_plazo[ok], cand_cuota[ok], con_saldos=True)
+        # un abono temprano baja el saldo de después: ningún abono ya asignado puede quedar mayor que su saldo
+        sobrepago = (cand_plazo[ok] + cand_cuota[ok] > saldos + 1e-6).any(axis=1)
+        intereses = np.where(sobrepago, np.inf, intereses)
+        mejor = int(np.argmin(intereses))
+        if intereses[mejor] >= interes_actual - 1e-9:
+            break
+        j = filas[ok][mejor]
+        if es_cuota[j]:
+            cuota[col[j]] += montos[j]
+        else:
+            plazo[col[j]] += montos[j]
+        interes_actual = float(intereses[mejor])
+
+    abonos = [Abono(periodo=int(k) + 1, monto=float(plazo[k]), tipo="plazo") for k in np.flatnonzero(plazo)]
+    abonos += [Abono(periodo=int(k) + 1, monto=float(cuota[k]), tipo="cuota") for k in np.flatnonzero(cuota)]
+    abonos.sort(key=lambda a: (a.periodo, a.tipo))
+    return ResultadoOptimizacion(abonos, interes_base, interes_actual)
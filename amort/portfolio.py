@@ -0,0 +1,189 @@
+# Cartera en paralelo: procesos que escriben las tablas directo en memoria compartida (sin pickle de DataFrames).
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kernel import METODO_CODIGOS, ArreglosAbonos, abonos_a_arreglos, generar_columnas
+from .loans import LoanSpec
+from .rates import tasas_periodicas_normalizadas
+from .schedule import _calendario, iterar_tabla
+
+# Columnas de la cartera (una fila por cuota de cada crédito). Fecha en datetime64[s] para que
+# pandas la envuelva sin convertir (y sin copiar).
+COLUMNAS_CARTERA: List[Tuple[str, str]] = [
+    ("Crédito", "int64"),       # posición del crédito en la lista de entrada
+    ("Periodo", "int64"),       # 0 en filas no usadas (créditos que terminan antes de n)
+    ("Fecha", "datetime64[s]"),
+    ("Cuota", "float64"),
+    ("Interés", "float64"),
+    ("Amortización", "float64"),
+    ("AbonoExtra", "float64"),
+    ("Saldo", "float64"),
+]
+
+def _adjuntar(nombre: str) -> shared_memory.SharedMemory:
+    """Abre un bloque existente sin que el proceso hijo lo registre como propio (Python 3.13+)."""
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=nombre)
+
+# Tarea de un proceso: (nombres de bloques, [(j, inicio, monto, i, n, frecuencia, fecha_inicio,
+#                        metodo, gradiente, ab_periodos, ab_montos, ab_tipos), ...])
+_Tarea = Tuple[Dict[str, str], List[tuple]]
+
+def _trabajar(tarea: _Tarea) -> List[Tuple[int, int]]:
+    """Calcula un bloque de créditos y escribe sus filas en la memoria compartida; retorna (j, filas)."""
+    nombres, creditos = tarea
+    bloques = {c: _adjuntar(nombres[c]) for c, _ in COLUMNAS_CARTERA}
+    try:
+        total = int(nombres["_filas_totales"])
+        arr = {c: np.ndarray((total,), dtype=dt, buffer=bloques[c].buf) for c, dt in COLUMNAS_CARTERA}
+        hechos = []
+        for (j, ini, monto, i, n, freq, fecha_inicio, metodo, g, per, mon, tip) in creditos:
+            if metodo in METODO_CODIGOS:
+                cols = generar_columnas(monto, i, n, per, mon, tip, metodo, g)
+            else:
+                abonos = ArreglosAbonos(per, mon, tip).a_abonos()
+                filas = np.array(list(iterar_tabla(monto, i, n, abonos, metodo, g)), dtype=float).reshape(-1, 6)
+                cols = dict(zip(["Periodo","Cuota","Interés","Amortización","AbonoExtra","Saldo"], filas.T))
+            f = len(cols["Periodo"])
+            fin = ini + f
+            arr["Crédito"][ini:fin] = j
+            arr["Fecha"][ini:fin] = _calendario(fecha_inicio, freq, n)[:f]
+            for c in ["Periodo","Cuota","Interés","Amortización","AbonoExtra","Saldo"]:
+                arr[c][ini:fin] = cols[c]
+            hechos.append((j, f))
+        del arr
+        return hechos
+    finally:
+        for b in bloques.values():
+            b.close()
+
+class ResultadoCartera:
+    """
+    Tablas de toda la cartera sobre bloques de memoria compartida.
+
+    'columnas' son arreglos de NumPy que apuntan directo a los bloques (sin copia). Cada crédito j
+    ocupa las filas [inicio[j], inicio[j] + n_j); solo las primeras filas[j] son válidas.
+    Llamar cerrar() (o usar 'with') para liberar los bloques.
+    """
+
+    def __init__(self, bloques: Dict[str, shared_memory.SharedMemory], inicio: np.ndarray,
+                 filas: np.ndarray, nombres: List[str]):
+        self._bloques = bloques
+        self.inicio = inicio
+        self.filas = filas
+        self.nombres = nombres
+        total = int(inicio[-1]) if len(inicio) else 0
+        self.columnas: Dict[str, np.ndarray] = {
+            c: np.ndarray((total,), dtype=dt, buffer=bloques[c].buf) for c, dt in COLUMNAS_CARTERA
+        }
+
+    def __enter__(self) -> "ResultadoCartera":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    def tabla(self, j: int) -> pd.DataFrame:
+        """Tabla del crédito j como vista (sin copia) sobre la memoria compartida."""
+        a = int(self.inicio[j])
+        b = a + int(self.filas[j])
+        return pd.DataFrame({c: self.columnas[c][a:b] for c, _ in COLUMNAS_CARTERA[1:]}, copy=False)
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """
+        Toda la cartera en un DataFrame. Si ningún crédito terminó antes de su plazo, envuelve los
+        bloques sin copiar; si hay filas sin usar, compacta (una copia).
+        """
+        df = pd.DataFrame(self.columnas, copy=False)
+        if int(self.filas.sum()) == len(df):
+            return df
+        return df[self.columnas["Periodo"] > 0].reset_index(drop=True)
+
+    def cerrar(self) -> None:
+        self.columnas = {}
+        for b in self._bloques.values():
+            try:
+                b.close()
+            except BufferError:  # aún hay vistas vivas; el bloque se libera cuando desaparezcan
+                pass
+            try:
+                b.unlink()
+            except FileNotFoundError:
+                pass
+        self._bloques = {}
+
+def ejecutar_cartera(
+    creditos: Sequence[LoanSpec],
+    procesos: Optional[int] = None,
+    creditos_por_tarea: int = 256,
+    tabla_abonos=None,
+    ids: Optional[Sequence[str]] = None,
+) -> ResultadoCartera:
+    """
+    Genera las tablas de una cartera con un pool de procesos.
+
+    El proceso padre normaliza todas las tasas en una pasada, reserva un bloque de memoria
+    compartida por columna (n_periodos filas por crédito, el máximo posible) y reparte los
+    créditos en tareas. Cada proceso escribe sus filas directo en los bloques y solo devuelve
+    cuántas filas usó por crédito; no se serializan DataFrames.
+    procesos=1 ejecuta en el mismo proceso (misma ruta de escritura, sin pool).
+    tabla_abonos (amort.prepayments.TablaAbonos): abonos por id (por defecto el nombre de cada crédito).
+    """
+    if not creditos:
+        raise ValueError("Se requiere al menos un crédito")
+    procesos = procesos or os.cpu_count() or 1
+    i_p = tasas_periodicas_normalizadas([c.tasa for c in creditos], [c.frecuencia for c in creditos])
+    n = np.array([c.n_periodos for c in creditos], dtype=np.int64)
+    if (n <= 0).any():
+        raise ValueError("n_periodos debe ser > 0")
+    inicio = np.concatenate([[0], np.cumsum(n)])
+    total = int(inicio[-1])
+
+    bloques: Dict[str, shared_memory.SharedMemory] = {}
+    try:
+        for c, dt in COLUMNAS_CARTERA:
+            bloques[c] = shared_memory.SharedMemory(create=True, size=max(1, total * np.dtype(dt).itemsize))
+        nombres = {c: b.name for c, b in bloques.items()}
+        nombres["_filas_totales"] = str(total)
+        # Los bloques nuevos vienen en cero: Periodo = 0 marca filas sin usar
+
+        if tabla_abonos is not None:
+            arreglos = tabla_abonos.para_creditos(ids if ids is not None else [c.nombre for c in creditos], creditos)
+        else:
+            arreglos = [abonos_a_arreglos(c.abonos) for c in creditos]
+        items = []
+        for j, c in enumerate(creditos):
+            per, mon, tip = arreglos[j]
+            items.append((j, int(inicio[j]), c.monto, float(i_p[j]), c.n_periodos, c.frecuencia,
+                          c.fecha_inicio, c.metodo, c.gradiente, per, mon, tip))
+        tareas = [(nombres, items[a:a + creditos_por_tarea]) for a in range(0, len(items), creditos_por_tarea)]
+
+        filas = np.zeros(len(creditos), dtype=np.int64)
+        if procesos == 1:
+            resultados = map(_trabajar, tareas)
+        else:
+            pool = ProcessPoolExecutor(max_workers=procesos)
+            resultados = pool.map(_trabajar, tareas)
+        try:
+            for hechos in resultados:
+                for j, f in hechos:
+                    filas[j] = f
+        finally:
+            if procesos != 1:
+                pool.shutdown()
+    except BaseException:
+        for b in bloques.values():
+            b.close()
+            b.unlink()
+        raise
+
+    nombres_creditos = [c.nombre or f"Crédito {j + 1}" for j, c in enumerate(creditos)]
+    return ResultadoCartera(bloques, inicio, filas, nombres_creditos)
@@ -0,0 +1,120 @@
+# Carga masiva de abonos desde archivos (CSV/JSONL/Parquet) a una tabla columnar indexada por (id, periodo).
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .kernel import TIPO_CUOTA, TIPO_PLAZO, ArreglosAbonos, abonos_a_arreglos
+from .loans import LoanSpec
+
+_VACIO = ArreglosAbonos(np.zeros(0, np.int64), np.zeros(0, np.float64), np.zeros(0, np.int8))
+
+class TablaAbonos:
+    """
+    Abonos de muchos créditos en cuatro arreglos contiguos ordenados por (id, periodo), más el
+    rango [inicio, fin) de cada id. Los abonos de un crédito son vistas (sin copia) de esos arreglos;
+    dentro de un mismo periodo se conserva el orden del archivo.
+    """
+
+    def __init__(self, ids: np.ndarray, inicio: np.ndarray, fin: np.ndarray,
+                 periodos: np.ndarray, montos: np.ndarray, tipos: np.ndarray):
+        self.ids = ids  # ids únicos ordenados (str)
+        self.inicio = inicio
+        self.fin = fin
+        self.periodos = periodos
+        self.montos = montos
+        self.tipos = tipos
+
+    @classmethod
+    def desde_dataframe(cls, df: pd.DataFrame) -> "TablaAbonos":
+        """df con columnas id, periodo, monto y tipo opcional ('plazo' por defecto)."""
+        faltan = [c for c in ("id", "periodo", "monto") if c not in df.columns]
+        if faltan:
+            raise ValueError(f"Faltan columnas de abonos: {', '.join(faltan)}")
+        if df["id"].isna().any():
+            raise ValueError("Hay abonos sin id de crédito")
+        periodos = df["periodo"].to_numpy(dtype=np.int64)
+        montos = df["monto"].to_numpy(dtype=np.float64)
+        if (periodos < 1).any():
+            raise ValueError("periodo de abono debe ser >= 1")
+        if (montos < 0).any():
+            raise ValueError("Abono negativo no permitido.")
+        tipo = df["tipo"].fillna("plazo") if "tipo" in df.columns else pd.Series("plazo", index=df.index)
+        if not tipo.isin(("plazo", "cuota")).all():
+            raise ValueError("Cada abono debe tener tipo 'plazo' o 'cuota'.")
+        tipos = np.where(tipo.to_numpy() == "cuota", TIPO_CUOTA, TIPO_PLAZO).astype(np.int8)
+
+        codigos, unicos = pd.factorize(df["id"].astype(str), sort=True)
+        orden = np.lexsort((periodos, codigos))  # estable: id, luego periodo, luego orden del archivo
+        conteo = np.bincount(codigos, minlength=len(unicos))
+        fin = np.cumsum(conteo)
+        return cls(np.asarray(unicos, dtype=str), fin - conteo, fin,
+                   periodos[orden], montos[orden], tipos[orden])
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """La tabla como filas id | periodo | monto | tipo (orden de la tabla); inversa de desde_dataframe."""
+        return pd.DataFrame({
+            "id": np.repeat(self.ids, self.fin - self.inicio),
+            "periodo": self.periodos,
+            "monto": self.montos,
+            "tipo": np.where(self.tipos == TIPO_CUOTA, "cuota", "plazo"),
+        })
+
+    def __len__(self) -> int:
+        return len(self.periodos)
+
+    def _posicion(self, loan_id: str) -> Optional[int]:
+        k = int(np.searchsorted(self.ids, loan_id))
+        return k if k < len(self.ids) and self.ids[k] == loan_id else None
+
+    def arreglos(self, loan_id: str) -> ArreglosAbonos:
+        """Abonos del crédito como vistas de la tabla (vacíos si no tiene)."""
+        k = self._posicion(str(loan_id))
+        if k is None:
+            return _VACIO
+        a, b = self.inicio[k], self.fin[k]
+        return ArreglosAbonos(self.periodos[a:b], self.montos[a:b], self.tipos[a:b])
+
+    def para_creditos(self, ids: Sequence[str], creditos: Sequence[LoanSpec] | None = None) -> List[ArreglosAbonos]:
+        """
+        Abonos de cada id (vistas). Si se pasan los créditos y alguno trae abonos propios, se combinan
+        con los de la tabla (los propios primero dentro de cada periodo); solo esos se copian.
+        """
+        out = [_VACIO] * len(ids)
+        if len(self.ids):
+            consulta = np.asarray([str(i) for i in ids], dtype=str)
+            pos = np.minimum(np.searchsorted(self.ids, consulta), len(self.ids) - 1)  # búsqueda en bloque
+            for j in np.flatnonzero(self.ids[pos] == consulta).tolist():
+                a, b = self.inicio[pos[j]], self.fin[pos[j]]
+                out[j] = ArreglosAbonos(self.periodos[a:b], self.montos[a:b], self.tipos[a:b])
+        for j, c in enumerate(creditos or ()):
+            if c.abonos:
+                propios = abonos_a_arreglos(c.abonos)
+                if len(out[j].periodos):
+                    juntos = [np.concatenate(par) for par in zip(propios, out[j])]
+                    orden = np.argsort(juntos[0], kind="stable")
+                    propios = ArreglosAbonos(*(x[orden] for x in juntos))
+                out[j] = propios
+        return out
+
+def cargar_abonos(ruta: str | Path) -> TablaAbonos:
+    """
+    Lee abonos de un archivo .csv, .jsonl o .parquet (columnas id, periodo, monto, [tipo]).
+    Parquet requiere la dependencia opcional pyarrow.
+    """
+    ruta = Path(ruta)
+    columnas = lambda c: c in ("id", "periodo", "monto", "tipo")
+    if ruta.suffix == ".csv":
+        df = pd.read_csv(ruta, usecols=columnas, dtype={"id": str, "tipo": str})
+    elif ruta.suffix == ".jsonl":
+        df = pd.read_json(ruta, lines=True, dtype={"id": str, "tipo": str})
+    elif ruta.suffix == ".parquet":
+        try:
+            df = pd.read_parquet(ruta)
+        except ImportError as e:
+            raise ImportError("Leer abonos en Parquet requiere pyarrow: pip install pyarrow") from e
+    else:
+        raise ValueError(f"Formato de abonos no soportado: {ruta.suffix} (usa .csv, .jsonl o .parquet)")
+    return TablaAbonos.desde_dataframe(df)
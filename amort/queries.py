@@ -0,0 +1,206 @@
+# Consultas por fecha: saldo, interés causado y valor de cancelación a cualquier fecha, sin armar la tabla.
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .loans import LoanSpec
+from .rates import tasas_periodicas_normalizadas
+from .schedule import Abono, PeriodoLiteral, _calendario, _verificar_forma_cerrada, iterar_tabla, obtener_metodo
+from .utils import FORMATO_FECHA
+
+FechaLike = Union[str, date, datetime, np.datetime64]
+
+def _a_datetime64(fechas: Union[FechaLike, Sequence[FechaLike]]) -> np.ndarray:
+    """
+    Convierte 'DD/MM/YYYY', date o datetime64 (uno o varios) a un array datetime64[D].
+    Arreglos datetime64 pasan sin recorrerlos; el texto se lee en bloque con pandas.
+    """
+    if isinstance(fechas, (str, date, np.datetime64)):
+        fechas = [fechas]
+    arr = np.asarray(fechas)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]")
+    if arr.size == 0:
+        return np.array([], dtype="datetime64[D]")
+    if arr.dtype.kind == "U":
+        return pd.to_datetime(arr, format=FORMATO_FECHA).to_numpy().astype("datetime64[D]")
+    # objetos: date/datetime, posiblemente mezclados con texto
+    es_texto = np.fromiter((isinstance(f, str) for f in arr), dtype=bool, count=arr.size)
+    out = np.empty(arr.size, dtype="datetime64[D]")
+    if es_texto.any():
+        out[es_texto] = pd.to_datetime(arr[es_texto].astype(str), format=FORMATO_FECHA).to_numpy()
+    if not es_texto.all():
+        out[~es_texto] = pd.to_datetime(arr[~es_texto]).to_numpy()
+    return out
+
+@lru_cache(maxsize=4096)
+def _indice_calendario(fecha_inicio: str, frecuencia: str, n: int) -> np.ndarray:
+    """[inicio, pago 1, ..., pago n] ordenado; compartido por todos los créditos con el mismo calendario."""
+    inicio = _a_datetime64(fecha_inicio)
+    cal = np.concatenate([inicio, _calendario(fecha_inicio, frecuencia, n)])
+    cal.flags.writeable = False
+    return cal
+
+def _posicion(cal: np.ndarray, fechas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Búsqueda binaria sobre el calendario: (k, fraccion) por fecha, donde k = cuotas vencidas
+    a la fecha (un pago en la misma fecha cuenta como hecho) y fraccion = parte transcurrida
+    del periodo k+1 (0 si ya terminó el crédito).
+    """
+    if (fechas < cal[0]).any():
+        raise ValueError("La fecha de consulta no puede ser anterior a la fecha de inicio")
+    n = len(cal) - 1
+    k = np.searchsorted(cal, fechas, side="right") - 1
+    k = np.minimum(k, n)
+    sig = np.minimum(k + 1, n)
+    dias_periodo = (cal[sig] - cal[k]).astype(np.int64)
+    dias = (fechas - cal[k]).astype(np.int64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraccion = np.where((k < n) & (dias_periodo > 0), dias / dias_periodo, 0.0)
+    return k, fraccion
+
+@dataclass(frozen=True)
+class Liquidacion:
+    fecha: date
+    periodo: int            # cuotas pagadas a la fecha
+    saldo: float            # saldo después de la última cuota pagada
+    interes_causado: float  # interés pro-rata desde la última cuota hasta la fecha
+    total: float            # valor para cancelar el crédito en la fecha
+
+class IndiceFechas:
+    """
+    Índice de consulta por fecha para un crédito (cualquier método registrado).
+
+    Guarda solo el calendario de pagos (ordenado) y, si hay abonos, el vector de saldos;
+    sin abonos el saldo sale de la forma cerrada del método. Cada consulta es una búsqueda binaria, O(log n).
+    Interés causado = saldo_k * i * (días transcurridos / días del periodo) (pro-rata lineal).
+    """
+
+    def __init__(
+        self,
+        monto: float,
+        i_periodo: float,
+        n_periodos: int,
+        frecuencia: PeriodoLiteral,
+        fecha_inicio: str,
+        abonos: Sequence[Abono] | None = None,
+        metodo: str = "frances",
+        gradiente: float = 0.0,
+    ):
+        if not fecha_inicio:
+            raise ValueError("Las consultas por fecha requieren fecha_inicio")
+        if monto <= 0:
+            raise ValueError("monto debe ser > 0")
+        if n_periodos <= 0:
+            raise ValueError("n_periodos debe ser > 0")
+        if i_periodo < 0:
+            raise ValueError("i_periodo no puede ser negativo")
+        self.monto = float(monto)
+        self.i = float(i_periodo)
+        self.n = int(n_periodos)
+        self.metodo = obtener_metodo(metodo)
+        self.gradiente = float(gradiente)
+        self.calendario = _indice_calendario(fecha_inicio, frecuencia, self.n)
+        self._saldos: Optional[np.ndarray] = None
+        if abonos:
+            # Con abonos no hay forma cerrada: se recorre el motor una vez (sin DataFrame) y se guarda solo el saldo
+            from .kernel import HAY_NUMBA, METODO_CODIGOS, abonos_a_arreglos, generar_columnas
+            if HAY_NUMBA and metodo in METODO_CODIGOS:
+                saldo_k = generar_columnas(self.monto, self.i, self.n, *abonos_a_arreglos(abonos),
+                                           metodo, self.gradiente)["Saldo"]
+            else:
+                saldo_k = np.fromiter((fila[5] for fila in iterar_tabla(self.monto, self.i, self.n, abonos,
+                                                                        metodo, self.gradiente)), dtype=float)
+            saldos = np.zeros(self.n + 1)
+            saldos[0] = self.monto
+            saldos[1:len(saldo_k) + 1] = saldo_k
+            self._saldos = saldos
+        else:
+            _verificar_forma_cerrada(self.metodo, self.monto, self.i, self.n, self.gradiente)
+
+    def _saldo_k(self, k: np.ndarray) -> np.ndarray:
+        if self._saldos is not None:
+            return self._saldos[k]
+        return self.metodo.saldos(self.monto, self.i, self.n, k, self.gradiente)
+
+    def consultar(self, fechas: Union[FechaLike, Sequence[FechaLike]]) -> pd.DataFrame:
+        """Consulta en lote: Fecha | Periodo | Saldo | InterésCausado | TotalCancelar."""
+        f = _a_datetime64(fechas)
+        k, fraccion = _posicion(self.calendario, f)
+        saldo = self._saldo_k(k)
+        interes = saldo * self.i * fraccion
+        return pd.DataFrame({
+            "Fecha": f,
+            "Periodo": k,
+            "Saldo": saldo,
+            "InterésCausado": interes,
+            "TotalCancelar": saldo + interes,
+        })
+
+    def liquidacion(self, fecha: FechaLike) -> Liquidacion:
+        fila = self.consultar(fecha).iloc[0]
+        return Liquidacion(
+            fecha=fila["Fecha"].date(),
+            periodo=int(fila["Periodo"]),
+            saldo=float(fila["Saldo"]),
+            interes_causado=float(fila["InterésCausado"]),
+            total=float(fila["TotalCancelar"]),
+        )
+
+def liquidaciones_lote(
+    creditos: Sequence[LoanSpec],
+    fechas: Union[FechaLike, Sequence[FechaLike]],
+) -> pd.DataFrame:
+    """
+    Saldo y valor de cancelación de cada crédito en cada fecha (producto créditos x fechas).
+
+    Las tasas se normalizan en una sola conversión vectorizada; los créditos sin abonos que comparten
+    calendario y método (fecha_inicio, frecuencia, n, método, gradiente) se resuelven juntos con una búsqueda binaria por fecha
+    y la forma cerrada del saldo como operación matricial. Los que tienen abonos usan IndiceFechas.
+    Columnas: Crédito | Fecha | Periodo | Saldo | InterésCausado | TotalCancelar
+    """
+    if not creditos:
+        raise ValueError("Se requiere al menos un crédito")
+    f = _a_datetime64(fechas)
+    i_p = tasas_periodicas_normalizadas([c.tasa for c in creditos], [c.frecuencia for c in creditos])
+
+    partes: List[Tuple[np.ndarray, pd.DataFrame]] = []  # (crédito de cada fila, filas)
+    grupos: Dict[Tuple[str, str, int, str, float], List[int]] = {}
+    for j, c in enumerate(creditos):
+        if not c.fecha_inicio:
+            raise ValueError(f"El crédito {c.nombre or j + 1} no tiene fecha_inicio")
+        if c.abonos:
+            idx = IndiceFechas(c.monto, i_p[j], c.n_periodos, c.frecuencia, c.fecha_inicio, c.abonos,
+                               c.metodo, c.gradiente)
+            partes.append((np.full(len(f), j), idx.consultar(f)))
+        else:
+            grupos.setdefault((c.fecha_inicio, c.frecuencia, c.n_periodos, c.metodo, c.gradiente), []).append(j)
+
+    for (inicio, freq, n, metodo, g), idx in grupos.items():
+        k, fraccion = _posicion(_indice_calendario(inicio, freq, n), f)
+        P = np.array([creditos[j].monto for j in idx], dtype=float)[:, None]
+        i = i_p[idx][:, None]
+        m = obtener_metodo(metodo)
+        _verificar_forma_cerrada(m, P, i, n, g)
+        saldo = m.saldos(P, i, n, k[None, :], g)  # (créditos del grupo, fechas)
+        interes = saldo * i * fraccion[None, :]
+        n_creditos = len(idx)
+        partes.append((np.repeat(idx, len(f)), pd.DataFrame({
+            "Fecha": np.tile(f, n_creditos),
+            "Periodo": np.tile(k, n_creditos),
+            "Saldo": saldo.ravel(),
+            "InterésCausado": interes.ravel(),
+            "TotalCancelar": (saldo + interes).ravel(),
+        })))
+
+    nombres = np.array([c.nombre or f"Crédito {j + 1}" for j, c in enumerate(creditos)], dtype=object)
+    orden = np.concatenate([o for o, _ in partes])
+    out = pd.concat([df for _, df in partes], ignore_index=True)
+    out.insert(0, "Crédito", nombres[orden])
+    # mismo orden que la entrada: crédito a crédito, fechas en el orden pedido
+    return out.iloc[np.argsort(orden, kind="stable")].reset_index(drop=True)
@@ -1,7 +1,9 @@
 # Conversión de tasas: nominal a efectiva, anticipada a vencida, y equivalencias entre frecuencias.
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Literal, Dict
+from typing import Literal, Dict, Sequence
+
+import numpy as np
 
 Freq = Literal["diaria","semanal","quincenal","mensual","bimestral","trimestral","semestral","anual"]
 TasaTipo = Literal["nominal","efectiva"]
@@ -74,4 +76,38 @@ def tasa_periodica_normalizada(rs: RateSpec, periodo_objetivo: str) -> float:
         i_ea  = (1.0 + i_ref) ** p_ref - 1.0
 
     # EA -> periódica objetivo (vencida)
-    return (1.0 + i_ea) ** (1.0 / p_obj) - 1.0
\ No newline at end of file
+    return (1.0 + i_ea) ** (1.0 / p_obj) - 1.0
+
+def tasas_periodicas_normalizadas(specs: Sequence[RateSpec], periodos_objetivo: Sequence[str]) -> np.ndarray:
+    """
+    Versión vectorizada de tasa_periodica_normalizada: una sola pasada para N tasas.
+    specs[k] se convierte al periodo periodos_objetivo[k] (vencida).
+    """
+    if len(specs) != len(periodos_objetivo):
+        raise ValueError("specs y periodos_objetivo deben tener la misma longitud")
+    valor = np.array([rs.valor for rs in specs], dtype=float) / 100.0
+    p_ref = np.array([_ppya(rs.capitalizacion, rs.base_dias) for rs in specs], dtype=float)
+    p_obj = np.array([_ppya(po, rs.base_dias) for rs, po in zip(specs, periodos_objetivo)], dtype=float)
+    nominal = np.array([rs.tipo == "nominal" for rs in specs], dtype=bool)
+    anticipada = np.array([rs.vencimiento == "anticipada" for rs in specs], dtype=bool)
+
+    i_ref = np.where(nominal, valor / p_ref, valor)
+    i_ref = np.where(anticipada, i_ref / (1.0 - i_ref), i_ref)
+    i_ea = (1.0 + i_ref) ** p_ref - 1.0
+    return (1.0 + i_ea) ** (1.0 / p_obj) - 1.0
+
+def n_from_duracion(freq_pago: str, base_dias: int, duracion: float, unidad: str) -> int:
+    """Convierte 'duracion + unidad' a número de cuotas según la frecuencia de pago."""
+    per_year_pago = _ppya(freq_pago, base_dias)
+    per_year_unidad = {
+        "dias": float(base_dias),
+        "semanas": 52.0,
+        "quincenas": 24.0,
+        "meses": 12.0,
+        "bimestres": 6.0,
+        "trimestres": 4.0,
+        "semestres": 2.0,
+        "anios": 1.0,
+    }[unidad]
+    n = int(round((duracion / per_year_unidad) * per_year_pago))
+    return max(1, n)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Literal, Sequence, Dict
+from typing import Any, Callable, Iterator, List, Optional, Literal, Sequence, Dict, Tuple
 from datetime import datetime, date, timedelta
 import calendar
 import math
 
+import numpy as np
 import pandas as pd
 
 
@@ -17,6 +18,9 @@ class Abono:
     monto: float
     tipo: Literal["plazo","cuota"] = "plazo"
 
+COLUMNAS_TABLA = ["Periodo","Fecha","Cuota","Interés","Amortización","AbonoExtra","Saldo"]
+TOL_CIERRE = 1e-2  # forzar cierre +- centavos
+
 
 # -------------------- Utilidades de fechas --------------------
 
@@ -89,6 +93,32 @@ def _add_one_period_eom(d: Optional[date], frecuencia: PeriodoLiteral, anchor_eo
         return _add_months_eom(d, 12, anchor_eom)
     raise ValueError(f"Frecuencia no soportada: {frecuencia!r}")
 
+_DIAS_POR_PERIODO = {"diaria": 1, "semanal": 7, "quincenal": 15}
+_MESES_POR_PERIODO = {"mensual": 1, "bimestral": 2, "trimestral": 3, "semestral": 6, "anual": 12}
+
+def _calendario(fecha_inicio: Optional[str], frecuencia: PeriodoLiteral, n: int) -> np.ndarray:
+    """
+    Fechas de pago 1..n como datetime64[D] (NaT si no hay fecha de inicio), sin bucle por fila.
+    Misma regla que _add_one_period_eom aplicado n veces: si el inicio es fin de mes, cada pago
+    cae en fin de mes; si no, el día se recorta al último día de cada mes y ya no vuelve a subir.
+    """
+    f0 = _parse_fecha_ddmmyyyy(fecha_inicio)
+    if f0 is None:
+        return np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+    k = np.arange(1, n + 1)
+    if frecuencia in _DIAS_POR_PERIODO:
+        return np.datetime64(f0, "D") + k * _DIAS_POR_PERIODO[frecuencia]
+    if frecuencia in _MESES_POR_PERIODO:
+        meses = np.datetime64(f0, "M") + k * _MESES_POR_PERIODO[frecuencia]
+        inicio_mes = meses.astype("datetime64[D]")
+        ultimo_dia = ((meses + 1).astype("datetime64[D]") - inicio_mes).astype(np.int64)
+        if _is_eom(f0):
+            dia = ultimo_dia
+        else:
+            dia = np.minimum.accumulate(np.minimum(f0.day, ultimo_dia))
+        return inicio_mes + (dia - 1)
+    raise ValueError(f"Frecuencia no soportada: {frecuencia!r}")
+
 
 
 # -------------------- Fórmulas financieras --------------------
@@ -101,23 +131,134 @@ def _cuota_frances(P: float, i: float, n: int) -> float:
     f = (1 + i) ** n
     return P * i * f / (f - 1)
 
+def _saldos_frances(P, i, n, k):
+    """Saldo tras k cuotas (forma cerrada, sin abonos). Acepta escalares o arrays de numpy."""
+    P, i, n, k = (np.asarray(x, dtype=float) for x in (P, i, n, k))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_n = (1.0 + i) ** n
+        saldo = np.where(i > 0, P * (f_n - (1.0 + i) ** k) / (f_n - 1.0), P * (1.0 - k / n))
+    return np.clip(saldo, 0.0, None)
+
+
+def _cuota_gradiente(P: float, i: float, n: int, g: float) -> float:
+    """Primera cuota de un gradiente geométrico (cuota_j = C·(1+g)^(j-1)) con valor presente P."""
+    if n <= 0:
+        raise ValueError("n debe ser > 0")
+    if abs(i - g) < 1e-15:
+        return P * (1 + i) / n
+    return P * (i - g) / (1 - ((1 + g) / (1 + i)) ** n)
+
+def _saldos_aleman(P, i, n, k):
+    P, n, k = (np.asarray(x, dtype=float) for x in (P, n, k))
+    return np.clip(P * (1.0 - k / n), 0.0, None)
+
+def _saldos_americano(P, i, n, k):
+    P, n, k = (np.asarray(x, dtype=float) for x in (P, n, k))
+    return np.where(k < n, P, 0.0)
+
+def _saldos_gradiente(P, i, n, k, g):
+    """Saldo tras k cuotas de un gradiente geométrico: P(1+i)^k - C·Σ (1+g)^(j-1) (1+i)^(k-j)."""
+    P, i, n, k, g = (np.asarray(x, dtype=float) for x in (P, i, n, k, g))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        igual = np.abs(i - g) < 1e-15
+        C = np.where(igual, P * (1 + i) / n, P * (i - g) / (1 - ((1 + g) / (1 + i)) ** n))
+        acumulado = np.where(igual, k * (1 + i) ** (k - 1), ((1 + i) ** k - (1 + g) ** k) / (i - g))
+        saldo = P * (1 + i) ** k - C * acumulado
+    return np.where(k >= n, 0.0, np.clip(saldo, 0.0, None))
+
+
+# -------------------- Métodos de amortización --------------------
+
+@dataclass(frozen=True)
+class MetodoAmortizacion:
+    """
+    Regla de pago de un método para el motor común (iterar_tabla / generar_tabla).
+
+    - base(saldo, i, rem, g): valor que el método mantiene entre recálculos (cuota francesa,
+      capital constante, primera cuota del gradiente). Se calcula al inicio y tras un abono 'cuota'.
+    - cuota(saldo, interes, base, j, rem, g): pago del periodo; j = periodos desde el último
+      recálculo (1, 2, ...), rem = periodos restantes incluyendo el actual.
+    - saldos(P, i, n, k, g): saldo tras k periodos sin abonos, forma cerrada vectorizada.
+    - amortiza_siempre: exige capital > 0 en cada periodo (si no, solo >= 0, p.ej. americano).
+    """
+    nombre: str
+    base: Callable[[float, float, int, float], float]
+    cuota: Callable[[float, float, float, int, int, float], float]
+    saldos: Callable[..., np.ndarray]
+    amortiza_siempre: bool = True
+
+METODOS: Dict[str, MetodoAmortizacion] = {}
+
+def registrar_metodo(metodo: MetodoAmortizacion) -> MetodoAmortizacion:
+    METODOS[metodo.nombre] = metodo
+    return metodo
+
+def obtener_metodo(nombre: str) -> MetodoAmortizacion:
+    try:
+        return METODOS[nombre]
+    except KeyError:
+        raise ValueError(f"Método no soportado: {nombre!r} (disponibles: {', '.join(METODOS)})") from None
+
+# Francés: cuota fija; con abono 'plazo' termina antes, con 'cuota' se recalcula la cuota.
+registrar_metodo(MetodoAmortizacion(
+    nombre="frances",
+    base=lambda saldo, i, rem, g: _cuota_frances(saldo, i, rem),
+    cuota=lambda saldo, interes, base, j, rem, g: base,
+    saldos=lambda P, i, n, k, g=0.0: _saldos_frances(P, i, n, k),
+))
+# Alemán: capital constante (cuota decreciente); 'cuota' reparte el saldo en los periodos restantes.
+registrar_metodo(MetodoAmortizacion(
+    nombre="aleman",
+    base=lambda saldo, i, rem, g: saldo / rem,
+    cuota=lambda saldo, interes, base, j, rem, g: interes + base,
+    saldos=lambda P, i, n, k, g=0.0: _saldos_aleman(P, i, n, k),
+))
+# Americano (bullet): solo intereses y todo el capital en la última cuota.
+registrar_metodo(MetodoAmortizacion(
+    nombre="americano",
+    base=lambda saldo, i, rem, g: 0.0,
+    cuota=lambda saldo, interes, base, j, rem, g: interes + (saldo if rem == 1 else 0.0),
+    saldos=lambda P, i, n, k, g=0.0: _saldos_americano(P, i, n, k),
+    amortiza_siempre=False,
+))
+# Gradiente geométrico: la cuota crece g por periodo.
+registrar_metodo(MetodoAmortizacion(
+    nombre="gradiente",
+    base=lambda saldo, i, rem, g: _cuota_gradiente(saldo, i, rem, g),
+    cuota=lambda saldo, interes, base, j, rem, g: base * (1 + g) ** (j - 1),
+    saldos=_saldos_gradiente,
+))
+
+def _verificar_amortizacion(m: MetodoAmortizacion, amort: np.ndarray) -> None:
+    """Regla de iterar_tabla aplicada a amortizaciones de forma cerrada: error si algún periodo no amortiza."""
+    amort = np.asarray(amort)
+    if (amort < 0).any() or (m.amortiza_siempre and (amort <= 0).any()):
+        raise ValueError("La cuota no amortiza (amortización <= 0). Revisa tasa/periodo.")
+
+def _verificar_forma_cerrada(m: MetodoAmortizacion, P, i, n: int, g: float) -> None:
+    """Verifica los n periodos sin abonos (P, i escalares o columnas de una matriz)."""
+    saldos = m.saldos(P, i, n, np.arange(int(n) + 1), g)
+    _verificar_amortizacion(m, -np.diff(saldos, axis=-1))
+
 
 # -------------------- Generador de tabla --------------------
 
-def generar_tabla_frances(
+def iterar_tabla(
     monto: float,
     i_periodo: float,
     n_periodos: int,
-    frecuencia: PeriodoLiteral,
-    fecha_inicio: Optional[str] = None,
     abonos: Sequence[Abono] | None = None,
-) -> pd.DataFrame:
+    metodo: str = "frances",
+    gradiente: float = 0.0,
+) -> Iterator[Tuple[int, float, float, float, float, float]]:
     """
-    Retorna SIEMPRE un pandas.DataFrame con columnas:
-    Periodo | Fecha | Cuota | Interés | Amortización | AbonoExtra | Saldo
+    Motor común: entrega las filas (Periodo, Cuota, Interés, Amortización, AbonoExtra, Saldo)
+    una a una, sin fechas ni DataFrame. El método solo aporta la regla de pago (MetodoAmortizacion);
+    abonos, recálculos y tolerancia de cierre son iguales para todos.
 
-    - tipo='plazo': mantiene cuota; reduce el número de cuotas (termina antes).
-    - tipo='cuota': mantiene plazo; recalcula la cuota a partir del periodo del abono.
+    - tipo='plazo': mantiene la regla vigente; el crédito termina antes.
+    - tipo='cuota': mantiene el plazo; recalcula la base del método desde el periodo del abono.
+    - gradiente: crecimiento de la cuota por periodo (decimal), solo para metodo='gradiente'.
     """
     if monto <= 0:
         raise ValueError("monto debe ser > 0")
@@ -125,6 +266,7 @@ def generar_tabla_frances(
         raise ValueError("n_periodos debe ser > 0")
     if i_periodo < 0:
         raise ValueError("i_periodo no puede ser negativo")
+    m = obtener_metodo(metodo)
 
     # Mapa de abonos por periodo
     abonos_map: Dict[int, List[Abono]] = {}
@@ -133,29 +275,19 @@ def generar_tabla_frances(
 
     saldo = float(monto)
     i = float(i_periodo)
+    g = float(gradiente)
     n_total = int(n_periodos)
-    # cuota vigente
-    cuota = _cuota_frances(saldo, i, n_total)
-
-    # fecha del primer pago = fecha_inicio + 1 periodo (si hay fecha)
-    f_actual = _parse_fecha_ddmmyyyy(fecha_inicio)
-# Anclar a fin de mes si la fecha de inicio es fin de mes y la frecuencia es mensual (o múltiplos de mes)
-    _usa_eom = False
-    if f_actual and frecuencia in {"mensual","bimestral","trimestral","semestral","anual"}:
-        _usa_eom = _is_eom(f_actual)
-
-    filas: List[dict] = []
-    tol_cierre = 1e-2  # forzar cierre +- centavos
+    base = m.base(saldo, i, n_total, g)
+    tol_cierre = TOL_CIERRE
 
     # Bucle por periodos. Para tipo 'plazo', la cantidad real de filas puede ser < n_total.
-    k = 1
+    k, j = 1, 1
     while k <= n_total and saldo > tol_cierre:
-        # avanzar fecha
-        f_actual = _add_one_period_eom(f_actual, frecuencia, _usa_eom)
         interes = saldo * i
+        cuota = m.cuota(saldo, interes, base, j, n_total - k + 1, g)
         amort = cuota - interes
 
-        if amort <= 0:
+        if amort < 0 or (amort == 0 and m.amortiza_siempre):
             raise ValueError("La cuota no amortiza (amortización <= 0). Revisa tasa/periodo.")
 
         # Si la amortización excede el saldo (última cuota cuando se acorta plazo)
@@ -180,44 +312,161 @@ def generar_tabla_frances(
             if saldo_nuevo < 0 and abs(saldo_nuevo) <= 1e-6:
                 saldo_nuevo = 0.0
 
-        # Registrar fila
-        filas.append({
-            "Periodo": k,
-            "Fecha": f_actual.strftime("%d/%m/%Y") if f_actual else None,
-            "Cuota": float(cuota_ef),
-            "Interés": float(interes),
-            "Amortización": float(amort),
-            "AbonoExtra": float(ab_extra),
-            "Saldo": float(max(saldo_nuevo, 0.0)),
-        })
+        # Si por redondeos queda un residuo minúsculo en la última fila, se reporta 0
+        saldo_fila = float(max(saldo_nuevo, 0.0))
+        if (saldo_nuevo <= tol_cierre or k == n_total) and abs(saldo_fila) < tol_cierre:
+            saldo_fila = 0.0
+        yield k, float(cuota_ef), float(interes), float(amort), float(ab_extra), saldo_fila
 
         saldo = saldo_nuevo
 
-        # Si hubo abonos tipo 'cuota', recalcular cuota para los periodos restantes (manteniendo plazo)
+        # Si hubo abonos tipo 'cuota', recalcular la base para los periodos restantes (manteniendo plazo)
         if k in abonos_map:
             hay_cuota = any(a.tipo == "cuota" for a in abonos_map[k])
             if hay_cuota:
                 rem = n_total - k
                 if saldo > tol_cierre and rem > 0:
-                    cuota = _cuota_frances(saldo, i, rem)
+                    base = m.base(saldo, i, rem, g)
+                    j = 0
 
         # Si el saldo ya es prácticamente cero, salimos
         if saldo <= tol_cierre:
-            saldo = 0.0
             break
 
         k += 1
+        j += 1
 
-    # Si por redondeos quedó un residuo minúsculo, forzamos a 0 la última fila
-    if filas:
-        filas[-1]["Saldo"] = 0.0 if abs(filas[-1]["Saldo"]) < tol_cierre else filas[-1]["Saldo"]
+def generar_tabla(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    frecuencia: PeriodoLiteral,
+    fecha_inicio: Optional[str] = None,
+    abonos: Sequence[Abono] | None = None,
+    metodo: str = "frances",
+    gradiente: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Retorna SIEMPRE un pandas.DataFrame con columnas:
+    Periodo | Fecha | Cuota | Interés | Amortización | AbonoExtra | Saldo
+    Fecha es datetime64 (NaT sin fecha_inicio); el texto DD/MM/YYYY se arma al mostrar/exportar.
+    metodo: uno de METODOS ('frances', 'aleman', 'americano', 'gradiente').
+    """
+    filas = list(iterar_tabla(monto, i_periodo, n_periodos, abonos, metodo, gradiente))
 
     # Armar DataFrame garantizando columnas y tipos
-    cols = ["Periodo","Fecha","Cuota","Interés","Amortización","AbonoExtra","Saldo"]
-    df = pd.DataFrame(filas, columns=cols)
+    df = pd.DataFrame(filas, columns=[c for c in COLUMNAS_TABLA if c != "Fecha"])
+    df.insert(1, "Fecha", _calendario(fecha_inicio, frecuencia, int(n_periodos))[:len(df)])
 
     # Asegurar tipos numéricos (útil para sumar en tests)
     for c in ["Cuota","Interés","Amortización","AbonoExtra","Saldo"]:
         df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
 
-    return df
\ No newline at end of file
+    return df
+
+def generar_tabla_frances(
+    monto: float,
+    i_periodo: float,
+    n_periodos: int,
+    frecuencia: PeriodoLiteral,
+    fecha_inicio: Optional[str] = None,
+    abonos: Sequence[Abono] | None = None,
+) -> pd.DataFrame:
+    """
+    Retorna SIEMPRE un pandas.DataFrame con columnas:
+    Periodo | Fecha | Cuota | Interés | Amortización | AbonoExtra | Saldo
+
+    - tipo='plazo': mantiene cuota; reduce el número de cuotas (termina antes).
+    - tipo='cuota': mantiene plazo; recalcula la cuota a partir del periodo del abono.
+    """
+    return generar_tabla(monto, i_periodo, n_periodos, frecuencia, fecha_inicio, abonos, metodo="frances")
+
+def intereses_sin_abonos(monto: float, i_periodo: float, n_periodos: int,
+                         metodo: str = "frances", gradiente: float = 0.0) -> float:
+    """Intereses totales del crédito sin abonos, desde la forma cerrada del saldo (sin armar la tabla)."""
+    m = obtener_metodo(metodo)
+    saldos = m.saldos(monto, i_periodo, n_periodos, np.arange(int(n_periodos) + 1), gradiente)
+    _verificar_amortizacion(m, -np.diff(saldos))
+    return float(np.sum(saldos[:-1]) * i_periodo)
+
+def generar_tablas_lote(
+    montos: Sequence[float],
+    i_periodos: Sequence[float],
+    n_periodos: Sequence[int],
+    frecuencias: Sequence[PeriodoLiteral],
+    fechas_inicio: Sequence[Optional[str]] | None = None,
+    abonos: Sequence[Any] | None = None,
+    metodos: Sequence[str] | None = None,
+    gradientes: Sequence[float] | None = None,
+) -> List[pd.DataFrame]:
+    """
+    Genera varias tablas en una sola pasada vectorizada.
+
+    Los créditos sin abonos se resuelven con la forma cerrada del saldo de su método, agrupados
+    por (n, método, gradiente) en matrices sin relleno; los que tienen abonos usan el núcleo
+    compilado de amort.kernel (si Numba está instalado) o generar_tabla.
+    Los abonos de cada crédito pueden ser una lista de Abono o kernel.ArreglosAbonos (arreglos planos).
+    Retorna una tabla por crédito, en el mismo orden y con las mismas columnas.
+    """
+    L = len(montos)
+    if not (len(i_periodos) == len(n_periodos) == len(frecuencias) == L):
+        raise ValueError("montos, i_periodos, n_periodos y frecuencias deben tener la misma longitud")
+    fechas_inicio = list(fechas_inicio) if fechas_inicio is not None else [None] * L
+    abonos = list(abonos) if abonos is not None else [None] * L
+    metodos = list(metodos) if metodos is not None else ["frances"] * L
+    gradientes = list(gradientes) if gradientes is not None else [0.0] * L
+
+    P = np.asarray(montos, dtype=float)
+    i = np.asarray(i_periodos, dtype=float)
+    n = np.asarray(n_periodos, dtype=int)
+    if (P <= 0).any():
+        raise ValueError("monto debe ser > 0")
+    if (n <= 0).any():
+        raise ValueError("n_periodos debe ser > 0")
+    if (i < 0).any():
+        raise ValueError("i_periodo no puede ser negativo")
+
+    # import diferido (kernel importa schedule)
+    from .kernel import HAY_NUMBA, METODO_CODIGOS, ArreglosAbonos, generar_tabla_arreglos, generar_tabla_kernel
+
+    tablas: List[Optional[pd.DataFrame]] = [None] * L
+    grupos: Dict[Tuple[int, str, float], List[int]] = {}
+    for j in range(L):
+        ab = abonos[j]
+        if isinstance(ab, ArreglosAbonos):
+            # Arreglos planos (p.ej. vistas de amort.prepayments.TablaAbonos): directo al núcleo, sin objetos Abono
+            if len(ab.periodos) and metodos[j] in METODO_CODIGOS:
+                tablas[j] = generar_tabla_arreglos(P[j], i[j], int(n[j]), frecuencias[j], fechas_inicio[j], ab,
+                                                   metodos[j], gradientes[j])
+                continue
+            ab = ab.a_abonos()
+        if ab:
+            # Con abonos no hay forma cerrada: núcleo compilado si existe, si no el motor en Python
+            generar = generar_tabla_kernel if HAY_NUMBA and metodos[j] in METODO_CODIGOS else generar_tabla
+            tablas[j] = generar(P[j], i[j], int(n[j]), frecuencias[j], fechas_inicio[j], ab,
+                                metodos[j], gradientes[j])
+        else:
+            grupos.setdefault((int(n[j]), metodos[j], float(gradientes[j])), []).append(j)
+
+    # Cada grupo es una matriz (créditos x periodos) sin relleno
+    for (n_g, metodo, g), idx in grupos.items():
+        m = obtener_metodo(metodo)
+        Pg, ig = P[idx][:, None], i[idx][:, None]
+        k = np.arange(1, n_g + 1)[None, :]
+        saldo_ant = m.saldos(Pg, ig, n_g, k - 1, g)
+        saldo = m.saldos(Pg, ig, n_g, k, g)
+        interes = saldo_ant * ig
+        amort = saldo_ant - saldo
+        _verificar_amortizacion(m, amort)
+        cuota = interes + amort
+        for fila, j in enumerate(idx):
+            tablas[j] = pd.DataFrame({
+                "Periodo": np.arange(1, n_g + 1),
+                "Fecha": _calendario(fechas_inicio[j], frecuencias[j], n_g),
+                "Cuota": cuota[fila],
+                "Interés": interes[fila],
+                "Amortización": amort[fila],
+                "AbonoExtra": np.zeros(n_g),
+                "Saldo": saldo[fila],
+            }, columns=COLUMNAS_TABLA)
+    return tablas
@@ -0,0 +1,266 @@
+# Corridas por shards: dividir una cartera, repartir shards entre trabajadores (coordinador sqlite) y unir resúmenes.
+from __future__ import annotations
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .compare import COLUMNAS_TOTALES, totales_tabla
+from .loans import LoanSpec, loan_desde_dict, tablas_de_creditos
+from .prepayments import TablaAbonos, cargar_abonos
+
+ARCHIVO_COORDINADOR = "coordinador.sqlite"
+COLUMNAS_RESUMEN = ["id"] + COLUMNAS_TOTALES
+
+def shard_de(loan_id: str, n_shards: int) -> int:
+    """Shard determinístico de un crédito (crc32 del id; estable entre procesos y máquinas)."""
+    return zlib.crc32(str(loan_id).encode("utf-8")) % n_shards
+
+def leer_cartera(path: str | Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Lee una cartera JSONL (un crédito por línea, claves de loan_desde_dict + 'id') o JSON (lista)."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as fh:
+        if path.suffix == ".json":
+            registros = json.load(fh)
+        else:
+            registros = (json.loads(linea) for linea in fh if linea.strip())
+        for k, d in enumerate(registros, start=1):
+            loan_id = d.get("id", d.get("nombre"))
+            if loan_id in (None, ""):
+                raise ValueError(f"{path}: el crédito #{k} no tiene 'id'")
+            yield str(loan_id), d
+
+def _ruta_shard(dir_trabajo: Path, shard: int) -> Path:
+    return dir_trabajo / "shards" / f"shard_{shard:05d}.jsonl"
+
+def _ruta_abonos(dir_trabajo: Path, shard: int) -> Path:
+    return dir_trabajo / "shards" / f"abonos_{shard:05d}.csv"
+
+def _ruta_salida(dir_trabajo: Path, shard: int) -> Path:
+    return dir_trabajo / "salidas" / f"shard_{shard:05d}.csv"
+
+def dividir_cartera(
+    entrada: str | Path,
+    dir_trabajo: str | Path,
+    n_shards: int,
+    abonos: Optional[str | Path] = None,
+) -> List[Path]:
+    """
+    Reparte la cartera en n_shards archivos JSONL por id (mismo id -> mismo shard siempre)
+    y registra los shards como pendientes en el coordinador. Falla si dir_trabajo ya tiene una corrida.
+    abonos: archivo de abonos (.csv/.jsonl/.parquet, ver cargar_abonos); se reparte con la misma regla
+    en un CSV por shard. Los abonos de ids que no están en la cartera no se usan.
+    """
+    if n_shards <= 0:
+        raise ValueError("n_shards debe ser > 0")
+    dir_trabajo = Path(dir_trabajo)
+    if (dir_trabajo / ARCHIVO_COORDINADOR).exists():
+        raise ValueError(f"{dir_trabajo} ya tiene una corrida; usa otro directorio")
+    tabla = cargar_abonos(abonos) if abonos is not None else None  # validar antes de escribir nada
+    (dir_trabajo / "shards").mkdir(parents=True, exist_ok=True)
+    (dir_trabajo / "salidas").mkdir(parents=True, exist_ok=True)
+
+    rutas = [_ruta_shard(dir_trabajo, s) for s in range(n_shards)]
+    archivos = [open(r, "w", encoding="utf-8") for r in rutas]
+    vistos = set()
+    try:
+        for loan_id, d in leer_cartera(entrada):
+            if loan_id in vistos:
+                raise ValueError(f"id de crédito repetido: {loan_id!r}")
+            vistos.add(loan_id)
+            archivos[shard_de(loan_id, n_shards)].write(json.dumps({**d, "id": loan_id}, ensure_ascii=False) + "\n")
+    finally:
+        for fh in archivos:
+            fh.close()
+    if tabla is not None:
+        _dividir_abonos(tabla, dir_trabajo, n_shards)
+
+    Coordinador.crear(dir_trabajo, n_shards)
+    return rutas
+
+def _dividir_abonos(tabla: TablaAbonos, dir_trabajo: Path, n_shards: int) -> None:
+    """Un CSV de abonos por shard que tenga alguno (la tabla ya viene agrupada por id)."""
+    shard_id = np.fromiter((shard_de(i, n_shards) for i in tabla.ids), dtype=np.int64, count=len(tabla.ids))
+    shard_fila = np.repeat(shard_id, tabla.fin - tabla.inicio)
+    for s, parte in tabla.a_dataframe().groupby(shard_fila, sort=True):
+        parte.to_csv(_ruta_abonos(dir_trabajo, int(s)), index=False, encoding="utf-8")
+
+class Coordinador:
+    """
+    Cola de shards en un archivo sqlite dentro de dir_trabajo (compartido entre hosts).
+
+    Estados: pendiente -> en_proceso -> hecho. Un shard en_proceso cuyo último latido tiene más de
+    'lease' segundos (trabajador caído) vuelve a poder reclamarse; tras max_intentos queda fallido.
+    El reclamo usa BEGIN IMMEDIATE: solo un trabajador a la vez puede tomar un shard.
+    sqlite requiere bloqueos de archivo funcionales en el sistema de archivos compartido.
+    """
+
+    def __init__(self, dir_trabajo: str | Path, lease: float = 600.0, max_intentos: int = 3):
+        self.dir_trabajo = Path(dir_trabajo)
+        self.ruta = self.dir_trabajo / ARCHIVO_COORDINADOR
+        if not self.ruta.exists():
+            raise FileNotFoundError(f"No hay coordinador en {self.dir_trabajo} (ejecuta dividir_cartera)")
+        self.lease = float(lease)
+        self.max_intentos = int(max_intentos)
+
+    @staticmethod
+    def crear(dir_trabajo: Path, n_shards: int) -> None:
+        with sqlite3.connect(Path(dir_trabajo) / ARCHIVO_COORDINADOR) as con:
+            con.execute(
+                "CREATE TABLE shards (id INTEGER PRIMARY KEY, estado TEXT NOT NULL, trabajador TEXT,"
+                " latido REAL, intentos INTEGER NOT NULL DEFAULT 0, error TEXT)"
+            )
+            con.executemany("INSERT INTO shards (id, estado) VALUES (?, 'pendiente')", [(s,) for s in range(n_shards)])
+        con.close()
+
+    @contextmanager
+    def _transaccion(self) -> Iterator[sqlite3.Connection]:
+        con = sqlite3.connect(self.ruta, timeout=60.0, isolation_level=None)
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            con.execute("COMMIT")
+        finally:
+            con.close()
+
+    def reclamar(self, trabajador: str) -> Optional[int]:
+        """Toma el siguiente shard pendiente (o vencido); None si no queda ninguno disponible."""
+        ahora = time.time()
+        with self._transaccion() as con:
+            con.execute(
+                "UPDATE shards SET estado = 'fallido' WHERE estado = 'en_proceso' AND latido < ? AND intentos >= ?",
+                (ahora - self.lease, self.max_intentos),
+            )
+            fila = con.execute(
+                "SELECT id FROM shards WHERE estado = 'pendiente' OR (estado = 'en_proceso' AND latido < ?)"
+                " ORDER BY id LIMIT 1",
+                (ahora - self.lease,),
+            ).fetchone()
+            if fila is None:
+                return None
+            con.execute(
+                "UPDATE shards SET estado = 'en_proceso', trabajador = ?, latido = ?, intentos = intentos + 1"
+                " WHERE id = ?",
+                (trabajador, ahora, fila[0]),
+            )
+            return int(fila[0])
+
+    def latido(self, shard: int, trabajador: str) -> None:
+        with self._transaccion() as con:
+            con.execute("UPDATE shards SET latido = ? WHERE id = ? AND trabajador = ? AND estado = 'en_proceso'",
+                        (time.time(), shard, trabajador))
+
+    def completar(self, shard: int, trabajador: str) -> None:
+        with self._transaccion() as con:
+            con.execute("UPDATE shards SET estado = 'hecho', latido = ?, error = NULL WHERE id = ? AND trabajador = ?",
+                        (time.time(), shard, trabajador))
+
+    def liberar(self, shard: int, trabajador: str, error: str) -> None:
+        """Devuelve el shard a pendiente tras un error (o lo marca fallido si agotó los intentos)."""
+        with self._transaccion() as con:
+            con.execute(
+                "UPDATE shards SET estado = CASE WHEN intentos >= ? THEN 'fallido' ELSE 'pendiente' END,"
+                " error = ? WHERE id = ? AND trabajador = ?",
+                (self.max_intentos, error[:2000], shard, trabajador),
+            )
+
+    def estado(self) -> pd.DataFrame:
+        con = sqlite3.connect(self.ruta, timeout=60.0)
+        try:
+            return pd.read_sql_query("SELECT * FROM shards ORDER BY id", con)
+        finally:
+            con.close()
+
+def resumir_tablas(ids: List[str], creditos: List[LoanSpec],
+                   tabla_abonos: Optional[TablaAbonos] = None) -> pd.DataFrame:
+    """
+    Genera las tablas en lote y retorna una fila de resumen por crédito (id + totales de compare).
+    tabla_abonos agrega a cada crédito los abonos de su id.
+    """
+    tablas = tablas_de_creditos(creditos, tabla_abonos, ids)
+    filas = [{"id": loan_id, **totales_tabla(df)} for loan_id, df in zip(ids, tablas)]
+    return pd.DataFrame(filas, columns=COLUMNAS_RESUMEN)
+
+def procesar_shard(dir_trabajo: str | Path, shard: int) -> Path:
+    """Calcula el resumen de un shard y lo escribe de forma atómica (archivo temporal + rename)."""
+    dir_trabajo = Path(dir_trabajo)
+    ids, creditos = [], []
+    for loan_id, d in leer_cartera(_ruta_shard(dir_trabajo, shard)):
+        ids.append(loan_id)
+        creditos.append(loan_desde_dict(d, loan_id))
+    ruta_abonos = _ruta_abonos(dir_trabajo, shard)
+    tabla = cargar_abonos(ruta_abonos) if ruta_abonos.exists() else None
+    resumen = resumir_tablas(ids, creditos, tabla)
+
+    from .utils import export_csv
+    destino = _ruta_salida(dir_trabajo, shard)
+    tmp = destino.with_name(f"{destino.name}.{socket.gethostname()}.{os.getpid()}.tmp")
+    export_csv(resumen, str(tmp))
+    os.replace(tmp, destino)
+    return destino
+
+def trabajar(
+    dir_trabajo: str | Path,
+    trabajador: Optional[str] = None,
+    lease: float = 600.0,
+    max_intentos: int = 3,
+    max_shards: Optional[int] = None,
+) -> int:
+    """
+    Bucle de un trabajador: reclama shards hasta que no quede ninguno disponible y retorna cuántos
+    procesó. Mientras procesa, un hilo renueva el latido cada lease/3 segundos.
+    Varios trabajadores (en este u otros hosts) pueden correr a la vez sobre el mismo dir_trabajo.
+    """
+    coord = Coordinador(dir_trabajo, lease, max_intentos)
+    trabajador = trabajador or f"{socket.gethostname()}:{os.getpid()}"
+    hechos = 0
+    while max_shards is None or hechos < max_shards:
+        shard = coord.reclamar(trabajador)
+        if shard is None:
+            break
+        parar = threading.Event()
+
+        def _latir(s=shard):
+            while not parar.wait(max(coord.lease / 3.0, 0.05)):
+                coord.latido(s, trabajador)
+
+        hilo = threading.Thread(target=_latir, daemon=True)
+        hilo.start()
+        try:
+            procesar_shard(dir_trabajo, shard)
+        except Exception as e:
+            coord.liberar(shard, trabajador, f"{type(e).__name__}: {e}")
+            continue
+        finally:
+            parar.set()
+            hilo.join()
+        coord.completar(shard, trabajador)
+        hechos += 1
+    return hechos
+
+def unir(dir_trabajo: str | Path, salida: Optional[str | Path] = None) -> pd.DataFrame:
+    """Une los resúmenes de todos los shards (ordenados por id). Falla si algún shard no terminó."""
+    dir_trabajo = Path(dir_trabajo)
+    estado = Coordinador(dir_trabajo).estado()
+    faltan = estado.loc[estado["estado"] != "hecho", "id"].tolist()
+    if faltan:
+        raise ValueError(f"Shards sin terminar: {faltan[:20]}{' ...' if len(faltan) > 20 else ''}")
+    partes = [pd.read_csv(_ruta_salida(dir_trabajo, int(s)), dtype={"id": str}, encoding="utf-8-sig")
+              for s in estado["id"]]
+    resumen = pd.concat(partes, ignore_index=True).sort_values("id", kind="stable").reset_index(drop=True)
+    if salida:
+        resumen.to_csv(salida, index=False, encoding="utf-8-sig")
+    return resumen
@@ -1,9 +1,52 @@
 from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, Tuple
 import pandas as pd
 
+FORMATO_FECHA = "%d/%m/%Y"
+
+def formatear_fechas(df: pd.DataFrame) -> pd.DataFrame:
+    """Copia de df con las columnas datetime como texto DD/MM/YYYY (vectorizado; NaT -> None)."""
+    cols = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+    if not cols:
+        return df
+    out = df.copy()
+    for c in cols:
+        out[c] = out[c].dt.strftime(FORMATO_FECHA).astype(object).where(out[c].notna(), None)
+    return out
+
 def export_csv(df: pd.DataFrame, path: str) -> None:
-    df.to_csv(path, index=False, encoding="utf-8-sig")
+    formatear_fechas(df).to_csv(path, index=False, encoding="utf-8-sig")
 
 def export_excel(df: pd.DataFrame, path: str, sheet_name: str = "Tabla") -> None:
     with pd.ExcelWriter(path, engine="openpyxl") as wr:
-        df.to_excel(wr, index=False, sheet_name=sheet_name)
\ No newline at end of file
+        formatear_fechas(df).to_excel(wr, index=False, sheet_name=sheet_name)
+
+EXPORTADORES: Dict[str, Callable[[pd.DataFrame, str], None]] = {
+    "CSV": export_csv,
+    "Excel": export_excel,
+}
+
+def exportar_en_segundo_plano(df: pd.DataFrame, rutas: Dict[str, str]) -> Dict[Future, Tuple[str, str]]:
+    """
+    Lanza los exportes en un pool de hilos (uno por formato) y retorna de inmediato.
+    rutas: {"CSV": "salida.csv", "Excel": "salida.xlsx"}; el df no debe modificarse mientras tanto.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, len(rutas)), thread_name_prefix="export")
+    futuros = {pool.submit(EXPORTADORES[fmt], df, ruta): (fmt, ruta) for fmt, ruta in rutas.items()}
+    pool.shutdown(wait=False)  # los exportes ya encolados terminan igual
+    return futuros
+
+def esperar_exportes(futuros: Dict[Future, Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """Entrega (formato, ruta) a medida que cada exporte termina; re-lanza el error si alguno falla."""
+    for fut in as_completed(futuros):
+        fut.result()
+        yield futuros[fut]
+
+def recortar_tabla(df: pd.DataFrame, max_filas: int) -> Tuple[pd.DataFrame, int]:
+    """Primeras y últimas filas para consola (sin tocar el resto). Retorna (recorte, filas_omitidas)."""
+    if max_filas <= 0 or len(df) <= max_filas:
+        return df, 0
+    cabeza = max_filas // 2
+    cola = max_filas - cabeza
+    return pd.concat([df.head(cabeza), df.tail(cola)]), len(df) - max_filas
@@ -4,12 +4,13 @@ from pathlib import Path
 from datetime import datetime
 import pandas as pd
 
-from amort.rates import RateSpec, tasa_periodica_normalizada, _ppya
-from amort.schedule import generar_tabla_frances, Abono
-from amort.utils import export_csv, export_excel
+from amort.rates import RateSpec, tasa_periodica_normalizada, _ppya, n_from_duracion
+from amort.schedule import generar_tabla, Abono, METODOS
+from amort.utils import exportar_en_segundo_plano, esperar_exportes, recortar_tabla, formatear_fechas
 
 UNIDADES = ["dias","semanas","quincenas","meses","bimestres","trimestres","semestres","anios"]
 PERIODOS = ["diaria","semanal","quincenal","mensual","bimestral","trimestral","semestral","anual"]
+MAX_FILAS_CONSOLA = 40  # tablas más largas se muestran recortadas (la tabla completa va al CSV/Excel)
 
 # --------- Inputs ---------
 def pfloat(msg: str, default: float | None = None) -> float:
@@ -54,21 +55,6 @@ def ppick(msg: str, opciones: list[str], default: str | None = None) -> str:
         print("⚠️ Opción inválida.")
 
 # --------- Helpers ---------
-def n_from_duracion(freq_pago: str, base_dias: int, duracion: float, unidad: str) -> int:
-    per_year_pago = _ppya(freq_pago, base_dias)
-    per_year_unidad = {
-        "dias": float(base_dias),
-        "semanas": 52.0,
-        "quincenas": 24.0,
-        "meses": 12.0,
-        "bimestres": 6.0,
-        "trimestres": 4.0,
-        "semestres": 2.0,
-        "anios": 1.0,
-    }[unidad]
-    n = int(round((duracion / per_year_unidad) * per_year_pago))
-    return max(1, n)
-
 def format_miles(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
     for c in ["Cuota","Interés","Amortización","AbonoExtra","Saldo"]:
@@ -76,9 +62,20 @@ def format_miles(df: pd.DataFrame) -> pd.DataFrame:
             out[c] = out[c].map(lambda x: f"{float(x):,.2f}")
     return out
 
+def render_tabla(df: pd.DataFrame, max_filas: int = MAX_FILAS_CONSOLA) -> str:
+    """Texto de la tabla para consola; solo formatea las filas visibles."""
+    vista, omitidas = recortar_tabla(df, max_filas)
+    texto = formatear_fechas(format_miles(vista)).to_string(index=False)
+    if not omitidas:
+        return texto
+    lineas = texto.splitlines()
+    corte = 1 + max_filas // 2  # encabezado + primeras filas
+    aviso = f"... {omitidas:,} filas omitidas (ver CSV/Excel para la tabla completa) ..."
+    return "\n".join(lineas[:corte] + [aviso] + lineas[corte:])
+
 # --------- App interactiva ---------
 def run_once():
-    print("\n==== Tabla de Amortización (método francés) ====\n")
+    print("\n==== Tabla de Amortización ====\n")
 
     # Monto
     monto = pfloat("Monto del crédito. Ej:", 7_000_000)
@@ -108,6 +105,10 @@ def run_once():
         base_tmp = 360
         n_periodos = n_from_duracion(frecuencia, base_tmp, duracion, unidad)
 
+    # Método de amortización (gradiente: la cuota crece g% por periodo)
+    metodo = ppick("Método de amortización", list(METODOS), "frances")
+    gradiente = pfloat("Crecimiento de la cuota por periodo (%)", 1.0) / 100.0 if metodo == "gradiente" else 0.0
+
     # Fecha de inicio (opcional)
     fecha_inicio = pstr("Fecha inicio (DD/MM/YYYY) o vacío si no quieres", "01/01/2025")
     if not fecha_inicio:
@@ -144,20 +145,30 @@ def run_once():
     print(f"Plazo: {n_periodos} cuotas ({frecuencia})")
 
     # Generar tabla
-    df = generar_tabla_frances(
+    df = generar_tabla(
         monto=monto,
         i_periodo=i_p,
         n_periodos=n_periodos,
         frecuencia=frecuencia,
         fecha_inicio=fecha_inicio,
         abonos=abonos,
+        metodo=metodo,
+        gradiente=gradiente,
     )
     if not isinstance(df, pd.DataFrame):
         df = pd.DataFrame(df)
 
-    # Mostrar formateado
-    out = format_miles(df)
-    print("\n" + out.to_string(index=False, max_rows=None))
+    # Export en segundo plano (CSV y Excel a la vez) mientras se muestra la tabla
+    outputs = Path("outputs"); outputs.mkdir(exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = f"tabla_{metodo}_{frecuencia}_{n_periodos}_{ts}"
+    futuros = exportar_en_segundo_plano(df, {
+        "CSV": str(outputs / f"{stem}.csv"),
+        "Excel": str(outputs / f"{stem}.xlsx"),
+    })
+
+    # Mostrar formateado (recortado si la tabla es larga)
+    print("\n" + render_tabla(df))
 
     # Resumen (numérico)
     tot_interes = float(pd.to_numeric(df["Interés"]).sum())
@@ -166,15 +177,10 @@ def run_once():
     tot_pagado  = tot_cuotas + tot_abonos
     print(f"\nResumen → Intereses: {tot_interes:,.2f} | Abonos: {tot_abonos:,.2f} | Total pagado: {tot_pagado:,.2f}")
 
-    # Export automático
-    outputs = Path("outputs"); outputs.mkdir(exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    stem = f"tabla_{frecuencia}_{n_periodos}_{ts}"
-    csv_path  = outputs / f"{stem}.csv"
-    xlsx_path = outputs / f"{stem}.xlsx"
-    export_csv(df, str(csv_path))
-    export_excel(df, str(xlsx_path))
-    print(f"\nArchivos guardados:\n- CSV  -> {csv_path}\n- Excel-> {xlsx_path}")
+    # Progreso del export: se informa cada archivo apenas termina
+    print(f"\nGuardando archivos ({len(futuros)})...")
+    for hechos, (fmt, ruta) in enumerate(esperar_exportes(futuros), start=1):
+        print(f"[{hechos}/{len(futuros)}] {fmt:<5} -> {ruta}")
 
 def main():
     try:
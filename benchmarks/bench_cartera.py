@@ -0,0 +1,75 @@
+"""
+Escalamiento de ejecutar_cartera (memoria compartida) de 1 a N procesos.
+
+    python benchmarks/bench_cartera.py --creditos 4000 --n 120 --max_procesos 8
+
+Reporta tiempo, speedup (t1 / tp) y eficiencia (speedup / p) por número de procesos, y como
+referencia el mismo trabajo devolviendo DataFrames por pickle desde un ProcessPoolExecutor.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from amort.loans import loan_desde_dict  # noqa: E402
+from amort.portfolio import ejecutar_cartera  # noqa: E402
+from amort.rates import tasa_periodica_normalizada  # noqa: E402
+from amort.schedule import generar_tabla  # noqa: E402
+
+def cartera_sintetica(cantidad: int, n: int, semilla: int = 7):
+    rnd = random.Random(semilla)
+    creditos = []
+    for j in range(cantidad):
+        abonos = [{"periodo": rnd.randint(1, n), "monto": rnd.uniform(1e4, 2e5), "tipo": rnd.choice(["plazo", "cuota"])}
+                  for _ in range(rnd.choice([0, 0, 2, 10]))]
+        creditos.append(loan_desde_dict({
+            "nombre": f"L{j}", "monto": rnd.uniform(1e6, 5e7), "tasa_valor": rnd.uniform(12, 30),
+            "tasa_tipo": "efectiva", "tasa_cap": "anual", "frecuencia": "mensual", "n_periodos": n,
+            "fecha_inicio": "31/01/2025", "metodo": rnd.choice(["frances", "aleman"]), "abonos": abonos,
+        }))
+    return creditos
+
+def _tabla_pickle(c):
+    i_p = tasa_periodica_normalizada(c.tasa, c.frecuencia)
+    return generar_tabla(c.monto, i_p, c.n_periodos, c.frecuencia, c.fecha_inicio, c.abonos, c.metodo, c.gradiente)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--creditos", type=int, default=4000)
+    p.add_argument("--n", type=int, default=120)
+    p.add_argument("--max_procesos", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--repeticiones", type=int, default=3)
+    args = p.parse_args(argv)
+
+    creditos = cartera_sintetica(args.creditos, args.n)
+    with ejecutar_cartera(creditos[:8], procesos=1):  # calentamiento (carga/compila el núcleo)
+        pass
+    print(f"Cartera: {args.creditos} créditos x {args.n} periodos | CPUs: {os.cpu_count()}")
+    print(f"{'procesos':>8} {'tiempo (s)':>11} {'speedup':>8} {'eficiencia':>10}")
+    t1 = None
+    for procs in range(1, args.max_procesos + 1):
+        tiempos = []
+        for _ in range(args.repeticiones):
+            t = time.perf_counter()
+            with ejecutar_cartera(creditos, procesos=procs) as res:
+                filas = int(res.filas.sum())
+            tiempos.append(time.perf_counter() - t)
+        tp = min(tiempos)
+        t1 = t1 or tp
+        print(f"{procs:>8} {tp:>11.3f} {t1 / tp:>8.2f} {t1 / tp / procs:>10.2%}")
+    print(f"Filas generadas: {filas:,}")
+
+    t = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.max_procesos) as pool:
+        tablas = list(pool.map(_tabla_pickle, creditos, chunksize=64))
+    print(f"Referencia pickle de DataFrames ({args.max_procesos} procesos): {time.perf_counter() - t:.3f} s "
+          f"({sum(len(x) for x in tablas):,} filas)")
+
+if __name__ == "__main__":
+    main()
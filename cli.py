@@ -1,15 +1,19 @@
 from __future__ import annotations
 import argparse, sys, json
+from pathlib import Path
 import pandas as pd
 
-from amort.rates import RateSpec, _ppya, tasa_periodica_normalizada
-from amort.schedule import generar_tabla_frances, Abono
+from amort.rates import RateSpec, _ppya, tasa_periodica_normalizada, n_from_duracion
+from amort.schedule import generar_tabla, METODOS
+from amort.utils import formatear_fechas
 
 UNIDADES = ["dias","semanas","quincenas","meses","bimestres","trimestres","semestres","anios"]
 PERIODOS = ["diaria","semanal","quincenal","mensual","bimestral","trimestral","semestral","anual"]
 
-def build_parser():
-    p = argparse.ArgumentParser(description="Tabla de Amortización (método francés)")
+def build_credito_parser(prog=None, description="Tabla de Amortización (francés, alemán, americano, gradiente)",
+                         abonos=True):
+    """Opciones del crédito comunes a la tabla y a los subcomandos (sin export ni vista previa)."""
+    p = argparse.ArgumentParser(prog=prog, description=description)
     # Crédito y tasa
     p.add_argument("--monto", type=float, required=True)
     p.add_argument("--tasa_valor", type=float, required=True, help="Porcentaje (ej. 24.33)")
@@ -23,33 +27,38 @@ def build_parser():
     p.add_argument("--duracion", type=float, default=None, help="Cantidad del plazo (ej. 6)")
     p.add_argument("--duracion_unidad", choices=UNIDADES, default=None, help="Unidad (meses, trimestres, etc.)")
 
+    # Método de amortización
+    p.add_argument("--metodo", choices=list(METODOS), default="frances",
+                   help="frances (cuota fija), aleman (capital fijo), americano (bullet), gradiente (cuota creciente)")
+    p.add_argument("--gradiente", type=float, default=0.0, help="Crecimiento de la cuota por periodo en %% (metodo=gradiente)")
+
     # Pago y fechas
     p.add_argument("--frecuencia", choices=PERIODOS, required=True)
     p.add_argument("--fecha_inicio", type=str, help="DD/MM/YYYY", default=None)
 
     # Extras
-    p.add_argument("--abonos_json", type=str, help='[{"periodo":6,"monto":1000,"tipo":"plazo"}]')
+    if abonos:
+        p.add_argument("--abonos_json", type=str, help='[{"periodo":6,"monto":1000,"tipo":"plazo"}]')
+    p.add_argument("--miles", action="store_true", help="Formatear valores con separador de miles")
+    return p
+
+def build_parser():
+    p = build_credito_parser()
     p.add_argument("--export_csv", type=str)
     p.add_argument("--export_xlsx", type=str)
     p.add_argument("--preview", type=int, default=0, help="Solo N filas (0=todas)")
-    p.add_argument("--miles", action="store_true", help="Formatear valores con separador de miles")
     return p
 
-def n_from_duracion(freq_pago: str, base_dias: int, duracion: float, unidad: str) -> int:
-    """Convierte 'duracion + unidad' a número de cuotas según la frecuencia de pago."""
-    per_year_pago = _ppya(freq_pago, base_dias)
-    per_year_unidad = {
-        "dias": float(base_dias),
-        "semanas": 52.0,
-        "quincenas": 24.0,
-        "meses": 12.0,
-        "bimestres": 6.0,
-        "trimestres": 4.0,
-        "semestres": 2.0,
-        "anios": 1.0,
-    }[unidad]
-    n = int(round((duracion / per_year_unidad) * per_year_pago))
-    return max(1, n)
+def build_compare_parser():
+    p = argparse.ArgumentParser(prog="cli.py comparar", description="Comparar varias ofertas de crédito")
+    p.add_argument("--creditos", type=str, required=True,
+                   help='Archivo .json o JSON en línea: [{"nombre":"A","monto":...,"tasa_valor":...,"tasa_tipo":...,'
+                        '"tasa_cap":...,"frecuencia":...,"n_periodos":...,"abonos":[...]}, ...]')
+    p.add_argument("--alinear", action="store_true", help="Mostrar además la tabla combinada alineada por fecha")
+    p.add_argument("--export_csv", type=str, help="Exportar el resumen a CSV")
+    p.add_argument("--export_xlsx", type=str, help="Exportar el resumen a Excel")
+    p.add_argument("--miles", action="store_true", help="Formatear valores con separador de miles")
+    return p
 
 def format_miles(df: pd.DataFrame, use_miles: bool) -> pd.DataFrame:
     if not use_miles:
@@ -60,16 +69,15 @@ def format_miles(df: pd.DataFrame, use_miles: bool) -> pd.DataFrame:
             out[c] = out[c].map(lambda x: f"{float(x):,.2f}")
     return out
 
-def main(argv=None):
-    argv = argv or sys.argv[1:]
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
+def resolver_tasa_y_plazo(args, parser):
+    """Valida monto/tasa/plazo, imprime la tasa por periodo y EA, y retorna (i_periodo, n_periodos)."""
     # --- Validaciones ---
     if args.monto <= 0:
         parser.error("monto debe ser > 0")
     if args.tasa_valor < 0:
         parser.error("tasa_valor no puede ser negativa")
+    if args.gradiente and args.metodo != "gradiente":
+        parser.error("--gradiente solo aplica con --metodo gradiente")
 
     # Resolver n_periodos (N) o duración+unidad
     if args.n_periodos is not None:
@@ -96,37 +104,227 @@ def main(argv=None):
     i_ea = (1 + i_p) ** ppy - 1
     print(f"Tasa por periodo ({args.frecuencia}) = {i_p*100:.6f}% | EA equivalente = {i_ea*100:.6f}%")
     print(f"Plazo: {n_periodos} cuotas ({args.frecuencia})")
+    return i_p, n_periodos
 
-    # Abonos
+def main_optimizar(argv):
+    from amort.optimizer import optimizar_abonos
+
+    parser = build_credito_parser("cli.py optimizar",
+                                  "Recomendar abonos (periodo y tipo) para un presupuesto, minimizando intereses",
+                                  abonos=False)
+    parser.add_argument("--presupuesto", type=float, required=True, help="Dinero total disponible para abonos")
+    parser.add_argument("--periodos", type=str, default=None, help="Periodos candidatos: '1-12' o '3,6,9' (defecto: todos)")
+    parser.add_argument("--tipos", type=str, default="plazo,cuota", help="Tipos permitidos: 'plazo', 'cuota' o 'plazo,cuota'")
+    parser.add_argument("--paso", type=float, default=None, help="Tamaño de cada incremento (defecto: presupuesto/20)")
+    parser.add_argument("--max_por_periodo", type=float, default=None, help="Tope de abono por periodo")
+    args = parser.parse_args(argv)
+    if args.presupuesto < 0:
+        parser.error("presupuesto no puede ser negativo")
+    if args.metodo != "frances":
+        parser.error("optimizar solo aplica al método francés")
+
+    i_p, n_periodos = resolver_tasa_y_plazo(args, parser)
+
+    periodos = None
+    if args.periodos:
+        try:
+            if "-" in args.periodos:
+                a, b = (int(x) for x in args.periodos.split("-", 1))
+                periodos = list(range(a, b + 1))
+            else:
+                periodos = [int(x) for x in args.periodos.split(",") if x.strip()]
+        except ValueError:
+            parser.error("--periodos debe ser un rango 'a-b' o una lista 'a,b,c'")
+    tipos = [t.strip() for t in args.tipos.split(",") if t.strip()]
+
+    try:
+        res = optimizar_abonos(
+            monto=args.monto, i_periodo=i_p, n_periodos=n_periodos, presupuesto=args.presupuesto,
+            periodos=periodos, tipos=tipos, paso=args.paso, max_por_periodo=args.max_por_periodo,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("\nAbonos recomendados:")
+    if not res.abonos:
+        print("  (ninguno: ningún abono reduce los intereses)")
+    for a in res.abonos:
+        print(f"  Periodo {a.periodo:>4} | {a.tipo:<5} | {a.monto:,.2f}")
+    print(f"\nIntereses sin abonos: {res.interes_base:,.2f} | Con abonos: {res.interes_optimo:,.2f} | Ahorro: {res.ahorro:,.2f}")
+    print("--abonos_json '" + json.dumps([{"periodo": a.periodo, "monto": round(a.monto, 2), "tipo": a.tipo} for a in res.abonos]) + "'")
+
+def parse_abonos_json(texto):
     abonos = []
-    if args.abonos_json:
+    if texto:
         try:
-            raw = json.loads(args.abonos_json)
-            for a in raw:
-                tipo = a.get("tipo","plazo")
-                if tipo not in ("plazo","cuota"):
-                    parser.error("Cada abono debe tener tipo 'plazo' o 'cuota'.")
-                abonos.append(Abono(periodo=int(a["periodo"]), monto=float(a["monto"]), tipo=tipo))
+            from amort.loans import abono_desde_dict
+            abonos = [abono_desde_dict(a) for a in json.loads(texto)]
         except Exception as e:
             raise SystemExit(f"--abonos_json inválido: {e}")
+    return abonos
+
+def main_liquidar(argv):
+    from amort.queries import IndiceFechas
+
+    parser = build_credito_parser("cli.py liquidar", "Saldo, interés causado y valor para cancelar a una o varias fechas")
+    parser.add_argument("--fechas", type=str, required=True, help="Fechas de corte DD/MM/YYYY separadas por coma")
+    args = parser.parse_args(argv)
+    if not args.fecha_inicio:
+        parser.error("liquidar requiere --fecha_inicio")
+
+    i_p, n_periodos = resolver_tasa_y_plazo(args, parser)
+    try:
+        idx = IndiceFechas(args.monto, i_p, n_periodos, args.frecuencia, args.fecha_inicio,
+                           parse_abonos_json(args.abonos_json), args.metodo, args.gradiente / 100.0)
+        df = idx.consultar([f.strip() for f in args.fechas.split(",") if f.strip()])
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = df.copy()
+    for c in ["Saldo","InterésCausado","TotalCancelar"]:
+        out[c] = out[c].map((lambda x: f"{x:,.2f}") if args.miles else (lambda x: f"{x:.2f}"))
+    print(formatear_fechas(out).to_string(index=False))
+
+def main_comparar(argv):
+    from amort.compare import comparar_creditos, tabla_alineada
+    from amort.loans import loan_desde_dict
+
+    parser = build_compare_parser()
+    args = parser.parse_args(argv)
+
+    fuente = args.creditos
+    try:
+        texto = Path(fuente).read_text(encoding="utf-8") if fuente.endswith(".json") else fuente
+        raw = json.loads(texto)
+        if not isinstance(raw, list) or not raw:
+            raise ValueError("se esperaba una lista no vacía de créditos")
+        creditos = [loan_desde_dict(d, f"Crédito {k}") for k, d in enumerate(raw, start=1)]
+    except Exception as e:
+        raise SystemExit(f"--creditos inválido: {e}")
+
+    resumen, tablas = comparar_creditos(creditos)
+
+    # Lado a lado: una columna por crédito
+    vista = resumen.copy()
+    montos = ["Cuota inicial","Intereses","Abonos","Total pagado","Ahorro abonos"]
+    for c in montos + ["Tasa periodo (%)","EA (%)"]:
+        fmt = "{:,.2f}" if args.miles and c in montos else ("{:.6f}" if "%" in c else "{:.2f}")
+        vista[c] = vista[c].map(fmt.format)
+    print(formatear_fechas(vista).set_index("Crédito").T.to_string())
+
+    if args.alinear:
+        combinada = tabla_alineada(creditos, tablas)
+        fmt = "{:,.2f}" if args.miles else "{:.2f}"
+        for c in combinada.columns[1:]:
+            combinada[c] = combinada[c].map(lambda x: "" if pd.isna(x) else fmt.format(x))
+        print("\n" + formatear_fechas(combinada).to_string(index=False))
+
+    if args.export_csv:
+        from amort.utils import export_csv
+        export_csv(resumen, args.export_csv)
+        print(f"CSV -> {args.export_csv}")
+    if args.export_xlsx:
+        from amort.utils import export_excel
+        export_excel(resumen, args.export_xlsx, sheet_name="Comparación")
+        print(f"Excel -> {args.export_xlsx}")
+
+def main_cartera(argv):
+    from amort.shards import Coordinador, dividir_cartera, trabajar, unir
+
+    parser = argparse.ArgumentParser(prog="cli.py cartera",
+                                     description="Cartera por shards entre varios trabajadores/hosts (directorio compartido)")
+    sub = parser.add_subparsers(dest="accion", required=True)
+    p = sub.add_parser("dividir", help="Reparte la cartera en shards por id de crédito")
+    p.add_argument("--entrada", required=True, help="Cartera .jsonl (un crédito por línea) o .json (lista)")
+    p.add_argument("--dir", required=True, help="Directorio de trabajo compartido")
+    p.add_argument("--shards", type=int, default=64)
+    p.add_argument("--abonos", default=None, help="Abonos por crédito: .csv/.jsonl/.parquet (id, periodo, monto, tipo)")
+    p = sub.add_parser("trabajar", help="Procesa shards hasta que no quede ninguno")
+    p.add_argument("--dir", required=True)
+    p.add_argument("--trabajador", default=None, help="Identificador (por defecto host:pid)")
+    p.add_argument("--lease", type=float, default=600.0, help="Segundos sin latido para reasignar un shard")
+    p.add_argument("--max_intentos", type=int, default=3)
+    p = sub.add_parser("estado", help="Estado de los shards")
+    p.add_argument("--dir", required=True)
+    p = sub.add_parser("unir", help="Une los resúmenes de todos los shards")
+    p.add_argument("--dir", required=True)
+    p.add_argument("--salida", default=None, help="CSV del resumen combinado")
+    p = sub.add_parser("recalcular", help="Recalcula solo los créditos cuyas entradas cambiaron")
+    p.add_argument("--entrada", required=True, help="Cartera .jsonl o .json (con 'id' por crédito)")
+    p.add_argument("--dir", required=True, help="Directorio de resultados (manifiesto + lotes)")
+    p.add_argument("--forzar", action="store_true", help="Recalcular toda la cartera")
+    p.add_argument("--abonos", default=None, help="Abonos por crédito: .csv/.jsonl/.parquet (id, periodo, monto, tipo)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.accion == "dividir":
+            rutas = dividir_cartera(args.entrada, args.dir, args.shards, args.abonos)
+            print(f"{len(rutas)} shards -> {args.dir}")
+        elif args.accion == "trabajar":
+            hechos = trabajar(args.dir, args.trabajador, args.lease, args.max_intentos)
+            print(f"Shards procesados: {hechos}")
+        elif args.accion == "recalcular":
+            from amort.incremental import recalcular_incremental
+            from amort.loans import loan_desde_dict
+            from amort.shards import leer_cartera
+            from amort.prepayments import cargar_abonos
+            creditos = [(i, loan_desde_dict(d, i)) for i, d in leer_cartera(args.entrada)]
+            tabla = cargar_abonos(args.abonos) if args.abonos else None
+            rep = recalcular_incremental(creditos, args.dir, forzar=args.forzar, tabla_abonos=tabla)
+            print(f"Reutilizados: {rep.reutilizados} | Recalculados: {rep.recalculados} | Retirados: {rep.eliminados}")
+        elif args.accion == "estado":
+            estado = Coordinador(args.dir).estado()
+            print(estado["estado"].value_counts().to_string())
+            fallidos = estado[estado["estado"] == "fallido"]
+            if len(fallidos):
+                print("\n" + fallidos[["id", "trabajador", "intentos", "error"]].to_string(index=False))
+        else:
+            resumen = unir(args.dir, args.salida)
+            print(f"{len(resumen)} créditos | Intereses: {resumen['Intereses'].sum():,.2f} | "
+                  f"Total pagado: {resumen['Total pagado'].sum():,.2f}")
+            if args.salida:
+                print(f"CSV -> {args.salida}")
+    except (ValueError, FileNotFoundError) as e:
+        raise SystemExit(str(e))
+
+def main(argv=None):
+    argv = argv or sys.argv[1:]
+    if argv and argv[0] == "cartera":
+        return main_cartera(argv[1:])
+    if argv and argv[0] == "comparar":
+        return main_comparar(argv[1:])
+    if argv and argv[0] == "optimizar":
+        return main_optimizar(argv[1:])
+    if argv and argv[0] == "liquidar":
+        return main_liquidar(argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    i_p, n_periodos = resolver_tasa_y_plazo(args, parser)
+
+    # Abonos
+    abonos = parse_abonos_json(args.abonos_json)
 
     # Tabla (asegurar DataFrame)
-    tabla = generar_tabla_frances(
-        monto=args.monto,
-        i_periodo=i_p,
-        n_periodos=n_periodos,
-        frecuencia=args.frecuencia,
-        fecha_inicio=args.fecha_inicio,
-        abonos=abonos,
-    )
+    try:
+        tabla = generar_tabla(
+            monto=args.monto,
+            i_periodo=i_p,
+            n_periodos=n_periodos,
+            frecuencia=args.frecuencia,
+            fecha_inicio=args.fecha_inicio,
+            abonos=abonos,
+            metodo=args.metodo,
+            gradiente=args.gradiente / 100.0,
+        )
+    except ValueError as e:
+        parser.error(str(e))
     df = tabla if isinstance(tabla, pd.DataFrame) else pd.DataFrame(tabla)
 
-    # Impresión
-    out = format_miles(df, args.miles)
-    if args.preview and args.preview > 0:
-        print(out.head(args.preview).to_string(index=False))
-    else:
-        print(out.to_string(index=False, max_rows=None))
+    # Impresión (fechas a DD/MM/YYYY solo para las filas que se muestran)
+    vista = df.head(args.preview) if args.preview and args.preview > 0 else df
+    out = formatear_fechas(format_miles(vista, args.miles))
+    print(out.to_string(index=False, max_rows=None))
 
     # Resumen (con df numérico, no con 'out' formateado)
     tot_interes = float(pd.to_numeric(df["Interés"]).sum())
@@ -0,0 +1,15 @@
+import pytest
+
+# Crédito de prueba común: 24% nominal mes vencido, pagos mensuales desde un 31 (fin de mes)
+CREDITO_BASE = {"tasa_valor": 24.0, "tasa_tipo": "nominal", "tasa_cap": "mensual",
+                "frecuencia": "mensual", "fecha_inicio": "31/01/2025"}
+METODOS_PRUEBA = ("frances", "aleman", "americano")
+
+def _credito_dict(j: int = 0, **cambios) -> dict:
+    return {**CREDITO_BASE, "id": f"C{j:03d}", "nombre": f"C{j:03d}", "monto": 1_000_000 + 1_000 * j,
+            "n_periodos": 12 + j % 7, "metodo": METODOS_PRUEBA[j % len(METODOS_PRUEBA)], **cambios}
+
+@pytest.fixture
+def credito_dict():
+    """credito_dict(j, **cambios): crédito j de la cartera de prueba (monto, plazo y método varían con j)."""
+    return _credito_dict
@@ -1,4 +1,5 @@
 import re
+import pytest
 from cli import main as cli_main
 
 def test_cli_smoke(capsys):
@@ -15,4 +16,25 @@ def test_cli_smoke(capsys):
     assert "Tasa por periodo (mensual)" in out
     assert "Plazo: 3 cuotas (mensual)" in out
     assert "Resumen" in out
-    assert re.search(r"\bPeriodo\b.*\bCuota\b.*\bInter[eé]s\b", out)
\ No newline at end of file
+    assert re.search(r"\bPeriodo\b.*\bCuota\b.*\bInter[eé]s\b", out)
+
+def test_cli_gradiente_solo_con_metodo_gradiente():
+    argv = ["--monto","100000","--tasa_valor","12","--tasa_tipo","efectiva","--tasa_cap","anual",
+            "--frecuencia","mensual","--n_periodos","12","--metodo","aleman","--gradiente","2"]
+    with pytest.raises(SystemExit) as e:
+        cli_main(argv)
+    assert e.value.code == 2
+
+def test_subcomandos_rechazan_opciones_de_la_tabla():
+    credito = ["--monto","100000","--tasa_valor","12","--tasa_tipo","efectiva","--tasa_cap","anual",
+               "--frecuencia","mensual","--n_periodos","12"]
+    casos = [
+        ["optimizar"] + credito + ["--presupuesto","1000","--export_csv","x.csv"],
+        ["optimizar"] + credito + ["--presupuesto","1000","--abonos_json","[]"],
+        ["liquidar"] + credito + ["--fecha_inicio","01/01/2025","--fechas","01/03/2025","--preview","3"],
+        ["liquidar"] + credito + ["--fecha_inicio","01/01/2025","--fechas","01/03/2025","--export_xlsx","x.xlsx"],
+    ]
+    for argv in casos:
+        with pytest.raises(SystemExit) as e:
+            cli_main(argv)
+        assert e.value.code == 2
@@ -0,0 +1,40 @@
+import json
+from amort.compare import comparar_creditos, tabla_alineada
+from amort.loans import loan_desde_dict
+from cli import main as cli_main
+
+OFERTAS = [
+    {"nombre": "A", "monto": 7_000_000, "tasa_valor": 24.33, "tasa_tipo": "efectiva", "tasa_cap": "anual",
+     "frecuencia": "mensual", "n_periodos": 24, "fecha_inicio": "01/01/2025"},
+    {"nombre": "B", "monto": 7_000_000, "tasa_valor": 24.33, "tasa_tipo": "efectiva", "tasa_cap": "anual",
+     "frecuencia": "mensual", "n_periodos": 24, "fecha_inicio": "01/01/2025",
+     "abonos": [{"periodo": 6, "monto": 1_000_000, "tipo": "plazo"}]},
+    {"nombre": "C", "monto": 7_000_000, "tasa_valor": 22.0, "tasa_tipo": "nominal", "tasa_cap": "mensual",
+     "tasa_venc": "anticipada", "frecuencia": "trimestral", "duracion": 2, "duracion_unidad": "anios",
+     "fecha_inicio": "15/01/2025"},
+]
+
+def test_resumen_compara_intereses_y_ahorro():
+    creditos = [loan_desde_dict(d) for d in OFERTAS]
+    resumen, tablas = comparar_creditos(creditos)
+    assert list(resumen["Crédito"]) == ["A", "B", "C"]
+    assert list(resumen["Cuotas"]) == [24, len(tablas[1]), 8]
+    a, b = resumen.iloc[0], resumen.iloc[1]
+    assert abs(a["EA (%)"] - 24.33) < 1e-9
+    assert abs(a["Ahorro abonos"]) < 1e-4
+    assert b["Ahorro abonos"] > 0
+    assert abs((a["Intereses"] - b["Intereses"]) - b["Ahorro abonos"]) < 1e-4
+
+def test_tabla_alineada_por_fecha():
+    creditos = [loan_desde_dict(d) for d in OFERTAS]
+    _, tablas = comparar_creditos(creditos)
+    comb = tabla_alineada(creditos, tablas)
+    assert comb.columns[0] == "Fecha"
+    assert comb["Cuota (A)"].notna().sum() == 24
+    assert comb["Cuota (C)"].notna().sum() == 8
+
+def test_cli_comparar(capsys):
+    cli_main(["comparar", "--creditos", json.dumps(OFERTAS[:2]), "--alinear"])
+    out = capsys.readouterr().out
+    assert "Ahorro abonos" in out
+    assert "Saldo (B)" in out
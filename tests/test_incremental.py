@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from amort.incremental import cargar_tabla, huella, recalcular_incremental
+from amort.loans import loan_desde_dict
+from amort.prepayments import TablaAbonos
+from amort.rates import tasa_periodica_normalizada
+from amort.schedule import generar_tabla
+
+ABONO = {"periodo": 4, "monto": 300_000, "tipo": "plazo"}
+
+def test_huella_normaliza_entradas(credito_dict):
+    a = loan_desde_dict(credito_dict(nombre="A"))
+    b = loan_desde_dict(credito_dict(nombre="B", monto=1_000_000.0, fecha_inicio="31/1/2025"))
+    assert huella(a) == huella(b)
+    c = loan_desde_dict(credito_dict(abonos=[{"periodo": 3, "monto": 10, "tipo": "plazo"}]))
+    assert huella(c) != huella(a)
+    assert huella(loan_desde_dict(credito_dict(gradiente=2.0))) == huella(a)  # solo aplica a 'gradiente'
+
+def test_solo_recalcula_lo_que_cambio(tmp_path, credito_dict):
+    cartera = [(d["id"], loan_desde_dict(d)) for d in (credito_dict(j) for j in range(6))]
+    rep = recalcular_incremental(cartera, tmp_path)
+    assert (rep.reutilizados, rep.recalculados, rep.eliminados) == (0, 6, 0)
+
+    rep = recalcular_incremental(cartera, tmp_path)
+    assert (rep.reutilizados, rep.recalculados, rep.lote) == (6, 0, None)
+
+    # C000 sale, C006 entra, C002 cambia
+    nueva = [(d["id"], loan_desde_dict(d))
+             for d in (credito_dict(j, abonos=[ABONO] if j == 2 else []) for j in range(1, 7))]
+    rep = recalcular_incremental(nueva, tmp_path)
+    assert (rep.reutilizados, rep.recalculados, rep.eliminados) == (4, 2, 1)
+    with pytest.raises(KeyError):
+        cargar_tabla(tmp_path, "C000")
+
+    for nombre, c in nueva:
+        ref = generar_tabla(c.monto, tasa_periodica_normalizada(c.tasa, c.frecuencia), c.n_periodos,
+                            c.frecuencia, c.fecha_inicio, c.abonos, c.metodo)
+        t = cargar_tabla(tmp_path, nombre)
+        assert len(t) == len(ref)
+        assert np.allclose(t["Saldo"], ref["Saldo"]) and (t["Fecha"] == ref["Fecha"]).all()
+
+def test_forzar_recalcula_todo_y_limpia_lotes(tmp_path, credito_dict):
+    cartera = [(d["id"], loan_desde_dict(d)) for d in (credito_dict(j) for j in range(6))]
+    recalcular_incremental(cartera, tmp_path)
+    rep = recalcular_incremental(cartera, tmp_path, forzar=True)
+    assert (rep.reutilizados, rep.recalculados) == (0, 6)
+    assert [p.name for p in (tmp_path / "lotes").iterdir()] == [rep.lote]
+
+def test_ids_repetidos(tmp_path, credito_dict):
+    cartera = [(d["id"], loan_desde_dict(d)) for d in (credito_dict(j) for j in range(2))]
+    with pytest.raises(ValueError):
+        recalcular_incremental(cartera * 2, tmp_path)
+
+def test_cambio_en_tabla_de_abonos_recalcula(tmp_path, credito_dict):
+    cartera = [(d["id"], loan_desde_dict(d)) for d in (credito_dict(j) for j in range(4))]
+    tabla = TablaAbonos.desde_dataframe(pd.DataFrame([{"id": "C001", **ABONO}]))
+    # mismos abonos desde la tabla o en el crédito: misma huella
+    assert huella(cartera[1][1], tabla.arreglos("C001")) == huella(loan_desde_dict(credito_dict(1, abonos=[ABONO])))
+    assert huella(cartera[0][1], tabla.arreglos("C000")) == huella(cartera[0][1])
+
+    recalcular_incremental(cartera, tmp_path, tabla_abonos=tabla)
+    rep = recalcular_incremental(cartera, tmp_path, tabla_abonos=tabla)
+    assert (rep.reutilizados, rep.recalculados) == (4, 0)
+
+    # C001 cambia su abono y C003 recibe uno nuevo
+    tabla = TablaAbonos.desde_dataframe(pd.DataFrame([{"id": "C001", **ABONO, "monto": 500_000},
+                                                      {"id": "C003", **ABONO}]))
+    rep = recalcular_incremental(cartera, tmp_path, tabla_abonos=tabla)
+    assert (rep.reutilizados, rep.recalculados) == (2, 2)
+    c = cartera[3][1]
+    ref = generar_tabla(c.monto, tasa_periodica_normalizada(c.tasa, c.frecuencia), c.n_periodos,
+                        c.frecuencia, c.fecha_inicio, tabla.arreglos("C003").a_abonos(), c.metodo)
+    assert np.allclose(cargar_tabla(tmp_path, "C003")["Saldo"], ref["Saldo"])
@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+from amort.kernel import HAY_NUMBA, TIPO_CUOTA, TIPO_PLAZO, abonos_a_arreglos, generar_columnas, generar_tabla_kernel
+from amort.schedule import Abono, generar_tabla
+
+NUCLEOS = [False, True] if HAY_NUMBA else [False]
+METODOS = [("frances", 0.0), ("aleman", 0.0), ("americano", 0.0), ("gradiente", 0.01)]
+
+def _abonos_aleatorios(semilla, n, cantidad, monto_max):
+    rnd = random.Random(semilla)
+    return [Abono(periodo=rnd.randint(1, n), monto=round(rnd.uniform(0, monto_max), 2),
+                  tipo=rnd.choice(["plazo", "cuota"])) for _ in range(cantidad)]
+
+def _comparar(df, ref):
+    assert list(df.columns) == list(ref.columns)
+    assert len(df) == len(ref)
+    assert df["Periodo"].tolist() == ref["Periodo"].tolist()
+    assert df["Fecha"].equals(ref["Fecha"])
+    for c in ["Cuota", "Interés", "Amortización", "AbonoExtra", "Saldo"]:
+        np.testing.assert_allclose(df[c].to_numpy(), ref[c].to_numpy(), rtol=1e-9, atol=1e-6)
+
+@pytest.mark.parametrize("compilado", NUCLEOS)
+@pytest.mark.parametrize("metodo,g", METODOS)
+@pytest.mark.parametrize("semilla", range(5))
+def test_paridad_con_motor_abonos_aleatorios(compilado, metodo, g, semilla):
+    n = 60
+    abonos = _abonos_aleatorios(semilla, n, cantidad=25, monto_max=40_000)
+    ref = generar_tabla(2_000_000, 0.015, n, "mensual", "31/01/2025", abonos, metodo, g)
+    df = generar_tabla_kernel(2_000_000, 0.015, n, "mensual", "31/01/2025", abonos, metodo, g, compilado)
+    _comparar(df, ref)
+
+@pytest.mark.parametrize("compilado", NUCLEOS)
+def test_paridad_casos_borde(compilado):
+    casos = [
+        (900_000, 0.0, 9, [Abono(periodo=3, monto=100_000, tipo="cuota")]),       # tasa 0
+        (1_000_000, 0.01, 12, [Abono(periodo=2, monto=2_000_000, tipo="plazo")]),  # abono mayor al saldo
+        (1_000_000, 0.01, 12, [Abono(periodo=40, monto=1_000, tipo="plazo")]),     # abono fuera del plazo
+        (1_000_000, 0.0005, 400, _abonos_aleatorios(7, 400, 300, 3_000)),          # diaria, muchos abonos
+    ]
+    for monto, i, n, abonos in casos:
+        ref = generar_tabla(monto, i, n, "diaria", None, abonos)
+        _comparar(generar_tabla_kernel(monto, i, n, "diaria", None, abonos, compilado=compilado), ref)
+
+def test_arreglos_planos_y_orden_estable():
+    abonos = [Abono(periodo=5, monto=10, tipo="cuota"), Abono(periodo=2, monto=20, tipo="plazo"),
+              Abono(periodo=5, monto=30, tipo="plazo")]
+    per, mon, tip = abonos_a_arreglos(abonos)
+    assert per.tolist() == [2, 5, 5]
+    assert mon.tolist() == [20, 10, 30]
+    assert tip.tolist() == [TIPO_PLAZO, TIPO_CUOTA, TIPO_PLAZO]
+    # arreglos desordenados se ordenan antes de entrar al núcleo
+    cols = generar_columnas(1_000_000, 0.01, 12, np.array([5, 2, 5]), np.array([10.0, 20.0, 30.0]),
+                            np.array([1, 0, 0], dtype=np.int8))
+    ref = generar_tabla(1_000_000, 0.01, 12, "mensual", None, abonos)
+    np.testing.assert_allclose(cols["Saldo"], ref["Saldo"].to_numpy(), atol=1e-6)
+
+def test_errores_igual_que_motor():
+    with pytest.raises(ValueError, match="Abono negativo"):
+        generar_tabla_kernel(1_000_000, 0.01, 12, "mensual", None, [Abono(periodo=3, monto=-1)])
+    with pytest.raises(ValueError, match="no amortiza"):
+        generar_tabla_kernel(1_000_000, 0.10, 12, "mensual", None, [], metodo="gradiente", gradiente=0.5)
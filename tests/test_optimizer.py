@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from amort.optimizer import ahorro_marginal, evaluar_abonos_lote, optimizar_abonos
+from amort.schedule import generar_tabla_frances, Abono
+from cli import main as cli_main
+
+P, I, N = 7_000_000, 0.0183, 24
+
+def _interes_tabla(abonos):
+    df = generar_tabla_frances(P, I, N, "mensual", None, abonos)
+    return float(df["Interés"].sum())
+
+def test_evaluador_lote_igual_que_tabla():
+    conjuntos = [
+        [],
+        [Abono(periodo=6, monto=1_000_000, tipo="plazo")],
+        [Abono(periodo=6, monto=1_000_000, tipo="cuota")],
+        [Abono(periodo=3, monto=500_000, tipo="cuota"), Abono(periodo=10, monto=800_000, tipo="plazo"),
+         Abono(periodo=10, monto=200_000, tipo="cuota")],
+        [Abono(periodo=2, monto=9_000_000, tipo="plazo")],  # abono mayor al saldo
+    ]
+    ab_p = np.zeros((len(conjuntos), N))
+    ab_c = np.zeros((len(conjuntos), N))
+    for j, conj in enumerate(conjuntos):
+        for a in conj:
+            (ab_c if a.tipo == "cuota" else ab_p)[j, a.periodo - 1] += a.monto
+    intereses = evaluar_abonos_lote(P, I, N, ab_p, ab_c)
+    for conj, v in zip(conjuntos, intereses):
+        assert abs(v - _interes_tabla(conj)) < 1e-6
+
+def test_ahorro_marginal_coincide_con_diferencia_finita():
+    base = _interes_tabla([])
+    delta = 1.0
+    for tipo in ("plazo", "cuota"):
+        m = ahorro_marginal(I, N, [6], tipo)[0]
+        ahorro = base - _interes_tabla([Abono(periodo=6, monto=delta, tipo=tipo)])
+        assert abs(ahorro / delta - m) < 1e-3
+    # acortar plazo ahorra más que recalcular cuota
+    assert ahorro_marginal(I, N, [6], "plazo")[0] > ahorro_marginal(I, N, [6], "cuota")[0]
+
+def test_optimizador_respeta_flujo_y_reporta_ahorro_real():
+    flujo = {k: 150_000 for k in range(1, 13)}
+    res = optimizar_abonos(P, I, N, presupuesto=5_000_000, periodos=range(1, 13), paso=150_000, flujo=flujo)
+    asignado = np.zeros(N)
+    for a in res.abonos:
+        asignado[a.periodo - 1] += a.monto
+    disponible = np.cumsum([flujo.get(k, 0) for k in range(1, N + 1)])
+    assert (np.cumsum(asignado) <= disponible + 1e-6).all()
+    assert abs(asignado.sum() - 1_800_000) < 1e-6
+    assert res.ahorro > 0
+    assert abs(res.interes_optimo - _interes_tabla(res.abonos)) < 1e-6
+
+def test_optimizador_solo_cuota_con_tope():
+    res = optimizar_abonos(P, I, N, presupuesto=1_000_000, periodos=range(1, 7), tipos=["cuota"],
+                           paso=250_000, max_por_periodo=250_000)
+    assert {a.tipo for a in res.abonos} == {"cuota"}
+    assert all(a.monto <= 250_000 + 1e-6 for a in res.abonos)
+    assert [a.periodo for a in res.abonos] == [1, 2, 3, 4]
+
+def test_cli_optimizar(capsys):
+    cli_main(["optimizar", "--monto", "7000000", "--tasa_valor", "24.33", "--tasa_tipo", "efectiva",
+              "--tasa_cap", "anual", "--frecuencia", "mensual", "--n_periodos", "24",
+              "--presupuesto", "1000000", "--periodos", "1-6"])
+    out = capsys.readouterr().out
+    assert "Abonos recomendados" in out
+    assert "Ahorro:" in out
+
+def test_optimizador_flujo_tardio():
+    # el ahorro marginal favorece periodos tempranos, pero el dinero llega en el periodo 100
+    res = optimizar_abonos(10_000_000, 0.015, 120, presupuesto=1_000_000, flujo={100: 1_000_000})
+    assert res.abonos and all(a.periodo >= 100 for a in res.abonos)
+    assert res.ahorro > 280_000
+
+def test_optimizador_rechaza_paso_no_positivo():
+    for paso in (0, -100):
+        with pytest.raises(ValueError):
+            optimizar_abonos(P, I, N, presupuesto=1_000_000, paso=paso)
+
+def test_optimizador_no_recomienda_pagar_de_mas():
+    casos = [((P, I, N), dict(presupuesto=P, periodos=range(1, 13))),
+             ((1_000_000, 0.02, 12), dict(presupuesto=5_000_000, paso=250_000)),
+             ((1_000_000, 0.02, 12), dict(presupuesto=2_000_000, paso=100_000, periodos=[3, 6, 9]))]
+    for (monto, i, n), kw in casos:
+        res = optimizar_abonos(monto, i, n, **kw)
+        assert res.abonos and res.ahorro > 0
+        df = generar_tabla_frances(monto, i, n, "mensual", None, res.abonos)
+        saldo_ant = np.concatenate(([monto], df["Saldo"].to_numpy()[:-1]))
+        # lo abonado en cada periodo no supera el saldo que queda tras la cuota
+        assert (df["AbonoExtra"].to_numpy() <= saldo_ant - df["Amortización"].to_numpy() + 1e-6).all()
+        assert sum(a.monto for a in res.abonos) <= monto
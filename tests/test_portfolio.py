@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+
+from amort.loans import loan_desde_dict
+from amort.portfolio import ejecutar_cartera
+from amort.rates import tasa_periodica_normalizada
+from amort.schedule import generar_tabla
+
+ABONO = {"periodo": 3, "monto": 400_000, "tipo": "plazo"}
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_cartera_igual_que_generar_tabla(procesos, credito_dict):
+    creditos = [loan_desde_dict(credito_dict(j, abonos=[ABONO] if j % 2 == 0 else [])) for j in range(9)]
+    with ejecutar_cartera(creditos, procesos=procesos, creditos_por_tarea=2) as res:
+        for j, c in enumerate(creditos):
+            i_p = tasa_periodica_normalizada(c.tasa, c.frecuencia)
+            ref = generar_tabla(c.monto, i_p, c.n_periodos, c.frecuencia, c.fecha_inicio, c.abonos, c.metodo)
+            t = res.tabla(j)
+            assert len(t) == len(ref) == res.filas[j]
+            assert (t["Fecha"].to_numpy() == ref["Fecha"].to_numpy()).all()
+            for col in ["Cuota", "Interés", "Amortización", "AbonoExtra", "Saldo"]:
+                assert np.abs(t[col].to_numpy() - ref[col].to_numpy()).max() < 1e-6
+            del t
+        df = res.a_dataframe()
+        assert len(df) == int(res.filas.sum())
+        assert (df["Periodo"] > 0).all()
+        del df
+
+def test_sin_filas_vacias_el_dataframe_no_copia(credito_dict):
+    creditos = [loan_desde_dict(credito_dict(j)) for j in range(9)]
+    with ejecutar_cartera(creditos, procesos=1) as res:
+        df = res.a_dataframe()
+        assert np.shares_memory(df["Saldo"].to_numpy(), res.columnas["Saldo"])
+        assert np.shares_memory(res.tabla(4)["Cuota"].to_numpy(), res.columnas["Cuota"])
+        del df
+
+def test_cerrar_libera_los_bloques(credito_dict):
+    res = ejecutar_cartera([loan_desde_dict(credito_dict(j, abonos=[ABONO])) for j in range(3)], procesos=1)
+    nombres = [b.name for b in res._bloques.values()]
+    res.cerrar()
+    for nombre in nombres:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nombre)
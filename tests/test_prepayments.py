@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from amort.kernel import TIPO_CUOTA, TIPO_PLAZO
+from amort.loans import loan_desde_dict, tablas_de_creditos
+from amort.portfolio import ejecutar_cartera
+from amort.prepayments import TablaAbonos, cargar_abonos
+from amort.schedule import Abono
+
+EVENTOS = [
+    {"id": "B", "periodo": 5, "monto": 100_000, "tipo": "cuota"},
+    {"id": "A", "periodo": 7, "monto": 50_000, "tipo": "plazo"},
+    {"id": "B", "periodo": 2, "monto": 200_000, "tipo": "plazo"},
+    {"id": "A", "periodo": 3, "monto": 10_000},
+    {"id": "A", "periodo": 3, "monto": 20_000, "tipo": "cuota"},
+]
+
+@pytest.fixture
+def creditos(credito_dict):
+    # A y B tienen abonos en EVENTOS, C no
+    return [loan_desde_dict(credito_dict(j, id=i, nombre=i, metodo=m))
+            for j, (i, m) in enumerate([("A", "frances"), ("C", "aleman"), ("B", "gradiente")])]
+
+@pytest.mark.parametrize("sufijo", [".csv", ".jsonl"])
+def test_carga_ordenada_por_id_y_periodo(tmp_path, sufijo):
+    ruta = tmp_path / f"abonos{sufijo}"
+    if sufijo == ".csv":
+        pd.DataFrame(EVENTOS).to_csv(ruta, index=False)
+    else:
+        ruta.write_text("\n".join(json.dumps(e) for e in EVENTOS))
+    t = cargar_abonos(ruta)
+    assert len(t) == 5 and t.ids.tolist() == ["A", "B"]
+    per, mon, tip = t.arreglos("A")
+    assert per.tolist() == [3, 3, 7] and mon.tolist() == [10_000, 20_000, 50_000]
+    assert tip.tolist() == [TIPO_PLAZO, TIPO_CUOTA, TIPO_PLAZO]
+    assert np.shares_memory(per, t.periodos) and np.shares_memory(mon, t.montos)
+    assert len(t.arreglos("Z").periodos) == 0
+
+def test_validaciones(tmp_path):
+    with pytest.raises(ValueError):
+        TablaAbonos.desde_dataframe(pd.DataFrame([{"id": "A", "periodo": 1, "monto": 5, "tipo": "otro"}]))
+    with pytest.raises(ValueError):
+        TablaAbonos.desde_dataframe(pd.DataFrame([{"id": "A", "periodo": 0, "monto": 5}]))
+    with pytest.raises(ValueError):
+        cargar_abonos(tmp_path / "abonos.txt")
+
+def test_lote_con_tabla_igual_que_con_objetos(creditos):
+    tabla = TablaAbonos.desde_dataframe(pd.DataFrame(EVENTOS))
+    con_tabla = tablas_de_creditos(creditos, tabla)
+
+    por_id = {}
+    for e in EVENTOS:
+        por_id.setdefault(e["id"], []).append(Abono(e["periodo"], e["monto"], e.get("tipo", "plazo")))
+    for c in creditos:
+        c.abonos = por_id.get(c.nombre, [])
+    ref = tablas_de_creditos(creditos)
+    for a, b in zip(con_tabla, ref):
+        assert len(a) == len(b)
+        assert (a["Fecha"].to_numpy() == b["Fecha"].to_numpy()).all()
+        for col in ["Cuota", "Interés", "AbonoExtra", "Saldo"]:
+            assert np.abs(a[col].to_numpy() - b[col].to_numpy()).max() < 1e-6
+
+def test_abonos_propios_se_combinan_y_cartera(creditos):
+    tabla = TablaAbonos.desde_dataframe(pd.DataFrame(EVENTOS))
+    creditos[0].abonos = [Abono(3, 5_000, "plazo")]
+    per, mon, _ = tabla.para_creditos(["A"], creditos[:1])[0]
+    assert per.tolist() == [3, 3, 3, 7] and mon.tolist() == [5_000, 10_000, 20_000, 50_000]
+
+    ref = tablas_de_creditos(creditos, tabla)
+    with ejecutar_cartera(creditos, procesos=1, tabla_abonos=tabla) as res:
+        for j, t in enumerate(ref):
+            assert res.filas[j] == len(t)
+            assert np.allclose(res.tabla(j)["Saldo"].to_numpy(), t["Saldo"].to_numpy())
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    ruta = tmp_path / "abonos.parquet"
+    pd.DataFrame(EVENTOS).to_parquet(ruta)
+    assert cargar_abonos(ruta).ids.tolist() == ["A", "B"]
@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+import pytest
+from amort.loans import loan_desde_dict
+from amort.queries import IndiceFechas, liquidaciones_lote
+from amort.schedule import generar_tabla, generar_tabla_frances, Abono
+from amort.utils import formatear_fechas
+
+P, I, N = 7_000_000, 0.0183, 24
+
+def test_saldo_en_fechas_de_pago_igual_que_tabla():
+    ab = [Abono(periodo=5, monto=900_000, tipo="cuota")]
+    for abonos in ([], ab):
+        df = generar_tabla_frances(P, I, N, "mensual", "31/01/2025", abonos)
+        idx = IndiceFechas(P, I, N, "mensual", "31/01/2025", abonos)
+        q = idx.consultar(list(formatear_fechas(df)["Fecha"]))
+        assert list(q["Periodo"]) == list(df["Periodo"])
+        assert (q["Saldo"] - df["Saldo"]).abs().max() < 1e-6
+        assert (q["InterésCausado"] == 0).all()
+
+def test_interes_causado_pro_rata_entre_pagos():
+    idx = IndiceFechas(P, I, N, "mensual", "01/01/2025")
+    liq = idx.liquidacion("16/02/2025")  # 15 de 28 días del segundo periodo
+    df = generar_tabla_frances(P, I, N, "mensual", "01/01/2025", [])
+    saldo_1 = float(df["Saldo"].iloc[0])
+    assert liq.periodo == 1
+    assert liq.saldo == pytest.approx(saldo_1, abs=1e-6)
+    assert liq.interes_causado == pytest.approx(saldo_1 * I * 15 / 28, abs=1e-6)
+    assert liq.total == pytest.approx(liq.saldo + liq.interes_causado)
+
+def test_fechas_fuera_de_rango():
+    idx = IndiceFechas(P, I, N, "mensual", "01/01/2025")
+    assert idx.liquidacion("01/01/2030").total == 0
+    with pytest.raises(ValueError):
+        idx.consultar("31/12/2024")
+
+def test_lote_igual_que_indice_por_credito():
+    base = {"monto": 2_000_000, "tasa_valor": 24.0, "tasa_tipo": "nominal", "tasa_cap": "mensual",
+            "frecuencia": "mensual", "n_periodos": 12, "fecha_inicio": "01/01/2025"}
+    creditos = [
+        loan_desde_dict({**base, "nombre": "A"}),
+        loan_desde_dict({**base, "nombre": "B", "monto": 3_000_000}),
+        loan_desde_dict({**base, "nombre": "C", "abonos": [{"periodo": 2, "monto": 500_000}]}),
+        loan_desde_dict({**base, "nombre": "D", "frecuencia": "quincenal", "n_periodos": 24}),
+    ]
+    fechas = ["20/03/2025", "01/02/2025", "10/10/2025"]
+    lote = liquidaciones_lote(creditos, fechas)
+    assert list(lote["Crédito"]) == [c for c in "ABCD" for _ in fechas]
+    for k, c in enumerate(creditos):
+        i_p = 0.02 if c.frecuencia == "mensual" else (1.02 ** 12) ** (1 / 24) - 1
+        ref = IndiceFechas(c.monto, i_p, c.n_periodos, c.frecuencia, c.fecha_inicio, c.abonos).consultar(fechas)
+        parte = lote.iloc[3 * k: 3 * k + 3].reset_index(drop=True)
+        assert (parte["TotalCancelar"] - ref["TotalCancelar"]).abs().max() < 1e-6
+        assert list(parte["Periodo"]) == list(ref["Periodo"])
+
+def test_indice_otros_metodos():
+    ab = [Abono(periodo=5, monto=900_000, tipo="plazo")]
+    for metodo, g in [("aleman", 0.0), ("americano", 0.0), ("gradiente", 0.01)]:
+        for abonos in ([], ab):
+            df = generar_tabla(P, I, N, "mensual", "01/01/2025", abonos, metodo=metodo, gradiente=g)
+            idx = IndiceFechas(P, I, N, "mensual", "01/01/2025", abonos, metodo=metodo, gradiente=g)
+            q = idx.consultar(list(formatear_fechas(df)["Fecha"]))
+            assert (q["Saldo"] - df["Saldo"]).abs().max() < 1e-6
+
+def test_fechas_texto_date_y_datetime64_equivalentes():
+    idx = IndiceFechas(P, I, N, "mensual", "01/01/2025")
+    texto = idx.consultar(["16/02/2025", "1/3/2025"])
+    fechas = [date(2025, 2, 16), date(2025, 3, 1)]
+    for otra in (fechas, np.array(fechas, dtype="datetime64[D]"), ["16/02/2025", date(2025, 3, 1)]):
+        assert idx.consultar(otra).equals(texto)
@@ -1,5 +1,5 @@
 import math
-from amort.rates import RateSpec, tasa_periodica_normalizada, _ppya
+from amort.rates import RateSpec, tasa_periodica_normalizada, tasas_periodicas_normalizadas, _ppya
 
 def approx(a, b, tol=1e-9):
     return abs(a - b) <= tol
@@ -25,4 +25,16 @@ def test_ea_2433_mensual_vs_ea_equivalente():
     i_m = tasa_periodica_normalizada(rs, "mensual")
     ppy = _ppya("mensual", 360)
     i_ea = (1 + i_m)**ppy - 1
-    assert math.isclose(i_ea, 0.2433, rel_tol=0, abs_tol=1e-9)
\ No newline at end of file
+    assert math.isclose(i_ea, 0.2433, rel_tol=0, abs_tol=1e-9)
+
+def test_tasas_vectorizadas_igual_que_escalar():
+    specs = [
+        RateSpec(valor=24.0, tipo="nominal", capitalizacion="mensual", vencimiento="vencida", base_dias=360),
+        RateSpec(valor=2.0, tipo="efectiva", capitalizacion="mensual", vencimiento="anticipada", base_dias=360),
+        RateSpec(valor=20.0, tipo="efectiva", capitalizacion="anual", vencimiento="vencida", base_dias=365),
+        RateSpec(valor=18.0, tipo="nominal", capitalizacion="trimestral", vencimiento="anticipada", base_dias=360),
+    ]
+    objetivos = ["mensual", "trimestral", "diaria", "semanal"]
+    vec = tasas_periodicas_normalizadas(specs, objetivos)
+    for rs, po, i_v in zip(specs, objetivos, vec):
+        assert math.isclose(i_v, tasa_periodica_normalizada(rs, po), rel_tol=1e-12, abs_tol=0)
@@ -1,7 +1,13 @@
 import math
+from datetime import datetime
+import numpy as np
 import pandas as pd
+import pytest
+from amort.queries import IndiceFechas
 from amort.rates import RateSpec, tasa_periodica_normalizada, _ppya
-from amort.schedule import generar_tabla_frances, Abono
+from amort.schedule import (METODOS, Abono, _add_one_period_eom, _calendario, _is_eom, generar_tabla,
+                            generar_tabla_frances, generar_tablas_lote, intereses_sin_abonos, iterar_tabla)
+from amort.utils import formatear_fechas
 
 def _i_periodo(ea_percent, freq="mensual", base=360):
     rs = RateSpec(valor=ea_percent, tipo="efectiva", capitalizacion="anual", vencimiento="vencida", base_dias=base)
@@ -56,7 +62,7 @@ def test_fechas_fin_de_mes_desde_31_enero():
     i_m = _i_periodo(18.0, "mensual")
     df = generar_tabla_frances(monto=1_000_000, i_periodo=i_m, n_periodos=6,
                                frecuencia="mensual", fecha_inicio="31/01/2025", abonos=[])
-    fechas = list(df["Fecha"].astype(str).head(6))
+    fechas = list(formatear_fechas(df)["Fecha"].head(6))
     assert fechas == ["28/02/2025","31/03/2025","30/04/2025","31/05/2025","30/06/2025","31/07/2025"]
 
 def test_diaria_base_360_vs_365_cierra_en_ambas():
@@ -73,4 +79,91 @@ def test_diaria_base_360_vs_365_cierra_en_ambas():
                                   frecuencia="diaria", fecha_inicio=None, abonos=[])
     assert abs(float(df360["Saldo"].iloc[-1])) < 1e-2
     assert abs(float(df365["Saldo"].iloc[-1])) < 1e-2
-    assert (df360["Amortización"] > 0).all() and (df365["Amortización"] > 0).all()
\ No newline at end of file
+    assert (df360["Amortización"] > 0).all() and (df365["Amortización"] > 0).all()
+
+def test_lote_igual_que_generar_tabla_frances():
+    casos = [
+        (7_000_000, _i_periodo(24.33), 24, "mensual", "01/01/2025", []),
+        (1_000_000, _i_periodo(18.0), 6, "mensual", "31/01/2025", []),
+        (900_000, 0.0, 9, "mensual", None, []),
+        (5_000_000, 0.02, 24, "mensual", "01/01/2025", [Abono(periodo=6, monto=1_800_000, tipo="plazo")]),
+        (1_000_000, _i_periodo(20.0, "diaria"), 30, "diaria", "15/02/2025", []),
+    ]
+    tablas = generar_tablas_lote(*[list(col) for col in zip(*casos)])
+    for caso, df in zip(casos, tablas):
+        ref = generar_tabla_frances(*caso)
+        assert list(df.columns) == list(ref.columns)
+        assert len(df) == len(ref)
+        assert df["Fecha"].equals(ref["Fecha"])
+        for c in ["Cuota","Interés","Amortización","AbonoExtra","Saldo"]:
+            assert (df[c] - ref[c]).abs().max() < 1e-6
+
+
+def test_calendario_vectorizado_igual_que_iterativo():
+    for inicio in ["31/01/2025", "30/01/2024", "29/02/2024", "15/03/2025", "31/12/2025"]:
+        for freq in ["diaria","semanal","quincenal","mensual","bimestral","trimestral","semestral","anual"]:
+            f = datetime.strptime(inicio, "%d/%m/%Y").date()
+            eom = freq not in ("diaria","semanal","quincenal") and _is_eom(f)
+            esperado = []
+            for _ in range(40):
+                f = _add_one_period_eom(f, freq, eom)
+                esperado.append(f)
+            got = [d.item() for d in _calendario(inicio, freq, 40)]
+            assert got == esperado, (inicio, freq)
+
+def test_fecha_columnar_datetime():
+    df = generar_tabla_frances(monto=1_000_000, i_periodo=0.01, n_periodos=12,
+                               frecuencia="mensual", fecha_inicio="15/01/2025", abonos=[])
+    assert pd.api.types.is_datetime64_any_dtype(df["Fecha"])
+    assert df["Fecha"].dt.month.tolist() == list(range(2, 13)) + [1]
+    sin_fecha = generar_tabla_frances(monto=1_000_000, i_periodo=0.01, n_periodos=3,
+                                      frecuencia="mensual", fecha_inicio=None, abonos=[])
+    assert sin_fecha["Fecha"].isna().all()
+    assert list(formatear_fechas(sin_fecha)["Fecha"]) == [None, None, None]
+
+
+def test_metodos_registrados_y_reglas_basicas():
+    assert {"frances","aleman","americano","gradiente"} <= set(METODOS)
+
+    al = generar_tabla(1_200_000, 0.02, 12, "mensual", "01/01/2025", [], metodo="aleman")
+    assert (al["Amortización"].round(6) == 100_000).all()
+    assert al["Cuota"].is_monotonic_decreasing
+
+    am = generar_tabla(1_000_000, 0.02, 6, "mensual", None, [], metodo="americano")
+    assert (am["Amortización"].iloc[:-1] == 0).all()
+    assert am["Amortización"].iloc[-1] == 1_000_000
+    assert math.isclose(am["Interés"].sum(), 6 * 20_000)
+
+    gr = generar_tabla(1_000_000, 0.02, 12, "mensual", None, [], metodo="gradiente", gradiente=0.01)
+    ratios = (gr["Cuota"].iloc[1:].to_numpy() / gr["Cuota"].iloc[:-1].to_numpy())
+    assert all(math.isclose(r, 1.01, rel_tol=1e-9) for r in ratios)
+    assert abs(float(gr["Saldo"].iloc[-1])) < 1e-2
+
+    with pytest.raises(ValueError):
+        generar_tabla(1_000_000, 0.02, 12, "mensual", None, [], metodo="inexistente")
+
+def test_metodos_forma_cerrada_y_lote_igual_que_motor():
+    ab = [Abono(periodo=4, monto=150_000, tipo="cuota"), Abono(periodo=8, monto=100_000, tipo="plazo")]
+    for metodo, g in [("frances", 0.0), ("aleman", 0.0), ("americano", 0.0), ("gradiente", 0.015)]:
+        df = generar_tabla(1_000_000, 0.018, 18, "mensual", "15/01/2025", [], metodo=metodo, gradiente=g)
+        cerrada = METODOS[metodo].saldos(1_000_000, 0.018, 18, np.arange(1, 19), g)
+        assert np.abs(df["Saldo"].to_numpy() - cerrada).max() < 1e-6
+        lote = generar_tablas_lote([1_000_000], [0.018], [18], ["mensual"], ["15/01/2025"],
+                                   metodos=[metodo], gradientes=[g])[0]
+        assert (lote["Cuota"] - df["Cuota"]).abs().max() < 1e-6
+        # Streaming: mismas filas que la tabla, incluso con abonos
+        con_ab = generar_tabla(1_000_000, 0.018, 18, "mensual", None, ab, metodo=metodo, gradiente=g)
+        filas = list(iterar_tabla(1_000_000, 0.018, 18, ab, metodo=metodo, gradiente=g))
+        assert [f[5] for f in filas] == list(con_ab["Saldo"])
+        assert abs(float(con_ab["Saldo"].iloc[-1])) < 1e-2
+
+def test_gradiente_que_no_amortiza_falla_igual_en_lote_y_motor():
+    args = (1_000_000, 0.02, 60)
+    with pytest.raises(ValueError, match="no amortiza"):
+        generar_tabla(*args, "mensual", metodo="gradiente", gradiente=0.10)
+    with pytest.raises(ValueError, match="no amortiza"):
+        generar_tablas_lote([args[0]], [args[1]], [args[2]], ["mensual"], metodos=["gradiente"], gradientes=[0.10])
+    with pytest.raises(ValueError, match="no amortiza"):
+        intereses_sin_abonos(*args, "gradiente", 0.10)
+    with pytest.raises(ValueError, match="no amortiza"):
+        IndiceFechas(*args, "mensual", "01/01/2025", metodo="gradiente", gradiente=0.10)
@@ -0,0 +1,106 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from amort.compare import COLUMNAS_TOTALES, comparar_creditos
+from amort.loans import loan_desde_dict
+from amort.rates import tasa_periodica_normalizada
+from amort.schedule import generar_tabla
+from amort.shards import Coordinador, dividir_cartera, procesar_shard, resumir_tablas, shard_de, trabajar, unir
+
+ABONO_CUOTA = {"periodo": 3, "monto": 200_000, "tipo": "cuota"}
+
+def _escribir(path, creditos):
+    path.write_text("".join(json.dumps(d) + "\n" for d in creditos), encoding="utf-8")
+    return path
+
+def test_shard_deterministico():
+    assert shard_de("C001", 16) == shard_de("C001", 16)
+    assert {shard_de(f"C{j}", 4) for j in range(100)} == {0, 1, 2, 3}
+
+def test_dividir_trabajar_unir(tmp_path, credito_dict):
+    creditos = [credito_dict(j, abonos=[ABONO_CUOTA] if j % 4 == 0 else []) for j in range(30)]
+    entrada = _escribir(tmp_path / "cartera.jsonl", creditos)
+    run = tmp_path / "run"
+    dividir_cartera(entrada, run, 5)
+    with pytest.raises(ValueError):
+        dividir_cartera(entrada, run, 5)
+
+    # dos trabajadores concurrentes: cada shard se procesa una sola vez
+    hechos = []
+    hilos = [threading.Thread(target=lambda w=w: hechos.append(trabajar(run, w))) for w in ("a", "b")]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert sum(hechos) == 5
+    assert (Coordinador(run).estado()["estado"] == "hecho").all()
+
+    resumen = unir(run, tmp_path / "resumen.csv")
+    assert resumen["id"].tolist() == [f"C{j:03d}" for j in range(30)]
+    d = creditos[4]
+    c = loan_desde_dict(d)
+    ref = generar_tabla(c.monto, tasa_periodica_normalizada(c.tasa, c.frecuencia), c.n_periodos,
+                        c.frecuencia, c.fecha_inicio, c.abonos, c.metodo)
+    fila = resumen.iloc[4]
+    assert fila["Cuotas"] == len(ref)
+    assert np.isclose(fila["Intereses"], ref["Interés"].sum())
+    assert fila["Fecha final"] == ref["Fecha"].iloc[-1].strftime("%d/%m/%Y")
+
+def test_shard_vencido_se_reasigna(tmp_path, credito_dict):
+    run = tmp_path / "run"
+    dividir_cartera(_escribir(tmp_path / "c.jsonl", [credito_dict(j) for j in range(6)]), run, 2)
+    coord = Coordinador(run, lease=60)
+    assert coord.reclamar("caido") == 0           # el trabajador muere sin completar
+    assert coord.reclamar("otro") == 1            # con lease vigente no se reasigna
+    assert coord.reclamar("otro") is None
+    with pytest.raises(ValueError):
+        unir(run)
+
+    assert trabajar(run, "rescate", lease=0) == 2  # lease vencido: se retoman ambos
+    estado = Coordinador(run).estado()
+    assert (estado["estado"] == "hecho").all()
+    assert estado["intentos"].tolist() == [2, 2]
+    assert len(unir(run)) == 6
+
+def test_error_libera_y_agota_intentos(tmp_path, credito_dict):
+    run = tmp_path / "run"
+    dividir_cartera(_escribir(tmp_path / "c.jsonl", [credito_dict(j) for j in range(3)]), run, 1)
+    (run / "shards" / "shard_00000.jsonl").write_text('{"id": "X", "monto": 1}\n')
+    assert trabajar(run, "w", max_intentos=2) == 0
+    fila = Coordinador(run).estado().iloc[0]
+    assert fila["estado"] == "fallido" and fila["intentos"] == 2
+    assert "Faltan campos" in fila["error"]
+
+def test_procesar_shard_escribe_salida(tmp_path, credito_dict):
+    run = tmp_path / "run"
+    dividir_cartera(_escribir(tmp_path / "c.jsonl", [credito_dict(j) for j in range(4)]), run, 1)
+    salida = procesar_shard(run, 0)
+    assert salida.exists() and not list(salida.parent.glob("*.tmp"))
+
+def test_resumen_igual_que_comparar(credito_dict):
+    creditos = [loan_desde_dict(credito_dict(j, abonos=[ABONO_CUOTA] if j % 3 == 0 else [])) for j in range(6)]
+    resumen = resumir_tablas([c.nombre for c in creditos], creditos)
+    comparacion, _ = comparar_creditos(creditos)
+    assert resumen[COLUMNAS_TOTALES].equals(comparacion[COLUMNAS_TOTALES])
+
+def test_dividir_con_archivo_de_abonos(tmp_path, credito_dict):
+    creditos = [credito_dict(j) for j in range(12)]
+    eventos = {"C001": [ABONO_CUOTA], "C006": [{"periodo": 2, "monto": 50_000, "tipo": "plazo"}, ABONO_CUOTA]}
+    filas = [{"id": i, **a} for i, abonos in eventos.items() for a in abonos]
+    filas.append({"id": "ZZZ", "periodo": 1, "monto": 10, "tipo": "plazo"})  # id fuera de la cartera
+    archivo = tmp_path / "abonos.csv"
+    pd.DataFrame(filas).to_csv(archivo, index=False)
+    run = tmp_path / "run"
+    dividir_cartera(_escribir(tmp_path / "c.jsonl", creditos), run, 3, abonos=archivo)
+    assert trabajar(run, "w") == 3
+
+    resumen = unir(run)
+    con_abonos = [loan_desde_dict({**d, "abonos": eventos.get(d["id"], [])}) for d in creditos]
+    ref = resumir_tablas([d["id"] for d in creditos], con_abonos)
+    assert resumen["Abonos"].gt(0).sum() == 2
+    assert (resumen["Cuotas"] == ref["Cuotas"]).all()
+    assert np.allclose(resumen["Intereses"], ref["Intereses"]) and np.allclose(resumen["Abonos"], ref["Abonos"])
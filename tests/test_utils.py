@@ -0,0 +1,38 @@
+import pandas as pd
+from amort.schedule import generar_tabla_frances
+from amort.utils import export_csv, exportar_en_segundo_plano, esperar_exportes, recortar_tabla
+from app import render_tabla
+
+def _tabla_diaria(n=500):
+    return generar_tabla_frances(monto=1_000_000, i_periodo=0.0005, n_periodos=n,
+                                 frecuencia="diaria", fecha_inicio="01/01/2025", abonos=[])
+
+def test_exportes_en_segundo_plano_csv_y_excel(tmp_path):
+    df = _tabla_diaria(50)
+    rutas = {"CSV": str(tmp_path / "t.csv"), "Excel": str(tmp_path / "t.xlsx")}
+    hechos = list(esperar_exportes(exportar_en_segundo_plano(df, rutas)))
+    assert sorted(hechos) == sorted(rutas.items())
+    assert len(pd.read_csv(rutas["CSV"])) == 50
+    assert len(pd.read_excel(rutas["Excel"])) == 50
+
+def test_recortar_tabla_primeras_y_ultimas_filas():
+    df = _tabla_diaria(500)
+    vista, omitidas = recortar_tabla(df, 10)
+    assert omitidas == 490
+    assert list(vista["Periodo"]) == [1, 2, 3, 4, 5, 496, 497, 498, 499, 500]
+    # tablas cortas no se recortan
+    corta, omitidas = recortar_tabla(df.head(8), 10)
+    assert omitidas == 0 and len(corta) == 8
+
+def test_render_tabla_larga_muestra_aviso():
+    texto = render_tabla(_tabla_diaria(500), max_filas=10)
+    lineas = texto.splitlines()
+    assert len(lineas) == 1 + 10 + 1
+    assert "490 filas omitidas" in lineas[6]
+
+def test_export_csv_fechas_ddmmyyyy(tmp_path):
+    df = generar_tabla_frances(monto=1_000_000, i_periodo=0.01, n_periodos=3,
+                               frecuencia="mensual", fecha_inicio="31/01/2025", abonos=[])
+    ruta = tmp_path / "t.csv"
+    export_csv(df, str(ruta))
+    assert list(pd.read_csv(ruta, dtype=str)["Fecha"]) == ["28/02/2025", "31/03/2025", "30/04/2025"]